@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the CDSE / CDAC / HLSGenerator toolchain
+Usage:
+  python benchmarks/run_benchmarks.py                     # run, compare with benchmarks/baseline.json
+  python benchmarks/run_benchmarks.py --quick             # skip the 10,000-layer cases
+  python benchmarks/run_benchmarks.py --update-baseline   # record the current numbers as the baseline
+
+Every case runs on a synthetic model (transformer stacks, random shape
+mixes, constraint grids) and reports wall time (best of --repeat runs),
+peak Python heap (one extra run under tracemalloc) and a solution-quality
+number where lower is better (predicted latency, bottleneck, generated
+files failing their consistency checks, ...). A case
+regresses when its time or memory grows past the tolerance or its quality
+gets worse at all; any regression exits non-zero. Timings are machine
+specific, so refresh the baseline when moving to another host.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from generate_hls import (HARDWARE_CONSTRAINTS, CDAC, CDSE, DesignSession, HBMPlanner, HLSGenerator,  # noqa: E402
+                          RooflineReport, ScaleOutPlanner, kernel_name)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+# -------------------------
+# Synthetic models
+# -------------------------
+def transformer_stack(num_layers, seq_len=512, hidden=1024, heads=16, ffn=4096):
+    """`num_layers` GEMMs from repeated encoder blocks: QKV, QK^T -> softmax -> V, projection, FFN."""
+    head_dim = hidden // heads
+    block = [
+        {"type": "mm", "M": seq_len, "K": hidden, "N": 3 * hidden},
+        {"type": "mm", "M": seq_len, "K": head_dim, "N": seq_len},
+        {"type": "softmax"},
+        {"type": "mm", "M": seq_len, "K": seq_len, "N": head_dim},
+        {"type": "mm", "M": seq_len, "K": hidden, "N": hidden},
+        {"type": "mm", "M": seq_len, "K": hidden, "N": ffn},
+        {"type": "gelu"},
+        {"type": "mm", "M": seq_len, "K": ffn, "N": hidden},
+    ]
+    layers, mm = [], 0
+    while mm < num_layers:
+        for layer in block:
+            if mm == num_layers:
+                break
+            if layer["type"] == "mm":
+                layer = dict(layer, name=f"mm{mm}")
+                mm += 1
+            layers.append(dict(layer))
+    return {"name": f"transformer_{num_layers}", "seq_len": seq_len, "layers": layers}
+
+
+def random_mix(num_layers, seed=0, lo_log2=4, hi_log2=12):
+    """Independent GEMMs with power-of-two-ish dims, some deliberately off the tile grid."""
+    rng = random.Random(seed)
+
+    def dim():
+        base = 1 << rng.randint(lo_log2, hi_log2)
+        return base if rng.random() < 0.7 else max(1, base + rng.randint(-base // 3, base // 3))
+
+    return {"name": f"random_{num_layers}_{seed}",
+            "layers": [{"type": "mm", "name": f"r{i}", "M": dim(), "K": dim(), "N": dim()} for i in range(num_layers)]}
+
+
+def constraint_grid(steps=(0.25, 0.5, 1.0, 2.0)):
+    """HARDWARE_CONSTRAINTS with DSP, on-chip memory and HBM scaled independently."""
+    grid = []
+    for dsp in steps:
+        for mem in steps:
+            for hbm in steps:
+                c = dict(HARDWARE_CONSTRAINTS)
+                c["total_dsp"] = int(c["total_dsp"] * dsp)
+                c["total_bram"] = int(c["total_bram"] * mem)
+                c["total_uram"] = int(c["total_uram"] * mem)
+                c["total_hbm_channels"] = max(1, int(c["total_hbm_channels"] * hbm))
+                c["hbm_bandwidth"] = c["hbm_bw_per_channel"] * c["total_hbm_channels"]
+                grid.append(c)
+    return grid
+
+
+# -------------------------
+# Cases: each returns a quality number (lower is better)
+# -------------------------
+def model_latency(cdac, model, acc_config):
+    return sum(l["latency_s"] for l in RooflineReport(cdac).build(model, acc_config)["layers"])
+
+
+def bench_sweep(grid_steps, shapes):
+    best = 0.0
+    for constraints in constraint_grid(grid_steps):
+        cdse = CDSE(constraints)
+        for M, K, N in shapes:
+            designs = cdse.explore_design_space(M, K, N, "large") or cdse.explore_design_space(M, K, N, "small")
+            if designs:
+                best += cdse.estimate_layer_latency(M, K, N, designs[0])
+    return best
+
+
+def bench_compose(model):
+    cdac = CDAC(CDSE(HARDWARE_CONSTRAINTS))
+    acc_config = cdac.compose_model(model)
+    return model_latency(cdac, model, acc_config)
+
+
+def bench_search(model, strategy, max_evals):
+    cdac = CDAC(CDSE(HARDWARE_CONSTRAINTS))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.json"
+        path.write_text(json.dumps(model))
+        acc_config = cdac.search_accelerators(path, num_accs=2, strategy=strategy, max_evals=max_evals, seed=0)
+    return acc_config["search"]["best_latency_s"]
+
+
+def bench_scale_out(model, cards):
+    planner = ScaleOutPlanner(CDAC(CDSE(HARDWARE_CONSTRAINTS)), cards)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.json"
+        path.write_text(json.dumps(model))
+        return planner.plan(path)["bottleneck_s"]
+
+
+def bench_hbm_plan(model):
+    cdac = CDAC(CDSE(HARDWARE_CONSTRAINTS))
+    plan = HBMPlanner(cdac).plan(model, cdac.compose_model(model))
+    return plan["activation_bytes"] / 2**20
+
+
+def bench_codegen(model):
+    """Kernels, connectivity and dispatch table into a scratch directory (never the project tree)."""
+    cdse = CDSE(HARDWARE_CONSTRAINTS)
+    acc_config = CDAC(cdse).compose_model(model)
+    hls_gen = HLSGenerator()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for i, acc in enumerate(acc_config["accelerators"]):
+            hls_gen.generate_kernel(acc, i, acc["type"] == "large", tmp)
+        hls_gen.generate_connectivity(acc_config, tmp / "hbm_connectivity.cfg")
+        hls_gen.generate_dispatch_table(acc_config, cdse, json_path=tmp / "dispatch_table.json",
+                                        header_path=tmp / "dispatch_table.h")
+        return float(len(codegen_problems(tmp, acc_config)))
+
+
+def kernel_args(source, name):
+    """Argument names of `void name(...)` in a generated kernel, or None if it is not defined."""
+    match = re.search(rf"void {name}\((.*?)\)\s*{{", source, re.S)
+    if match is None:
+        return None
+    return {arg.split()[-1].lstrip("*&") for arg in re.sub(r"//[^\n]*", "", match.group(1)).split(",") if arg.strip()}
+
+
+def codegen_problems(out_dir, acc_config):
+    """
+    Consistency checks over generated files, standing in for a compile the
+    benchmark host cannot run: balanced kernel sources, INTERFACE pragmas and
+    connectivity ports that name real kernel arguments, and a dispatch table
+    whose header and JSON agree on the kernels and bucket count.
+    """
+    problems, args = [], {}
+    for acc in acc_config["accelerators"]:
+        name = kernel_name(acc)
+        path = out_dir / f"{name}.cpp"
+        if not path.exists():
+            problems.append(f"{name}: kernel source missing")
+            continue
+        source = path.read_text()
+        args[name] = kernel_args(source, name)
+        if args[name] is None:
+            problems.append(f"{name}: no top function")
+            continue
+        for open_, close in ("{}", "()", "[]"):
+            if source.count(open_) != source.count(close):
+                problems.append(f"{name}: unbalanced {open_}{close}")
+        for port in re.findall(r"#pragma HLS INTERFACE \w+ port=(\w+)", source):
+            if port != "return" and port not in args[name]:
+                problems.append(f"{name}: INTERFACE pragma on unknown port {port}")
+
+    cfg = (out_dir / "hbm_connectivity.cfg").read_text()
+    for kernel in re.findall(r"^nk=(\w+):", cfg, re.M):
+        if kernel not in args:
+            problems.append(f"connectivity: nk for unknown kernel {kernel}")
+    cu_kernel = dict((cu, k) for k, cus in re.findall(r"^nk=(\w+):\d+:(\S+)", cfg, re.M) for cu in cus.split("."))
+    for cu, port in re.findall(r"(\w+)\.(\w+)(?=[:\s]|$)", "\n".join(
+            line for line in cfg.splitlines() if line.startswith(("sp=", "stream_connect=")))):
+        kernel = cu_kernel.get(cu)
+        if kernel is None or args.get(kernel) is None or port not in args[kernel]:
+            problems.append(f"connectivity: {cu}.{port} is not a kernel argument")
+
+    table = json.loads((out_dir / "dispatch_table.json").read_text())
+    header = (out_dir / "dispatch_table.h").read_text()
+    buckets = table["max_log2"] - table["min_log2"] + 1
+    if len(table["entries"]) != buckets ** 3 or header.count("\n    {") != buckets ** 3:
+        problems.append("dispatch table: entry count does not match the bucket grid")
+    if f"kBuckets = {buckets};" not in header:
+        problems.append("dispatch table: header and JSON disagree on kBuckets")
+    for kernel in table["kernels"]:
+        if kernel not in args:
+            problems.append(f"dispatch table: unknown kernel {kernel}")
+    return problems
+
+
+def bench_whatif(model):
+    """One session answering a round of what-if queries: reserve DSPs, shrink BRAM, add and edit layers."""
+    session = DesignSession(model)
+    session.evaluate()
+    session.reserve(dsp=500)
+    session.evaluate()
+    session.set_constraints(total_bram=HARDWARE_CONSTRAINTS["total_bram"] // 2)
+    session.evaluate()
+    session.add_layer({"type": "mm", "M": 512, "K": 1024, "N": 1000})
+    session.update_layer(0, N=77)
+    return session.evaluate()["latency_s"]
+
+
+def cases(quick=False):
+    shapes = [(3072, 1024, 1024), (512, 512, 64), (128, 4096, 128), (65536, 128, 512)]
+    suite = [
+        ("sweep/grid64x4", lambda: bench_sweep((0.25, 0.5, 1.0, 2.0), shapes)),
+        ("compose/transformer10", lambda: bench_compose(transformer_stack(10))),
+        ("compose/transformer100", lambda: bench_compose(transformer_stack(100))),
+        ("compose/transformer1000", lambda: bench_compose(transformer_stack(1000))),
+        ("compose/random1000", lambda: bench_compose(random_mix(1000))),
+        ("search/anneal_random100", lambda: bench_search(random_mix(100), "anneal", 500)),
+        ("search/genetic_random100", lambda: bench_search(random_mix(100), "genetic", 500)),
+        ("schedule/scaleout4_transformer1000", lambda: bench_scale_out(transformer_stack(1000), 4)),
+        ("schedule/hbm_plan_transformer1000", lambda: bench_hbm_plan(transformer_stack(1000))),
+        ("codegen/transformer100", lambda: bench_codegen(transformer_stack(100))),
+        ("session/whatif_transformer1000", lambda: bench_whatif(transformer_stack(1000))),
+    ]
+    if not quick:
+        # Scale-out partitioning and HBM allocation are quadratic in layers, so they stay at 1,000
+        suite += [
+            ("compose/transformer10000", lambda: bench_compose(transformer_stack(10000))),
+            ("compose/random10000", lambda: bench_compose(random_mix(10000, seed=1))),
+            ("session/whatif_transformer10000", lambda: bench_whatif(transformer_stack(10000))),
+            ("session/whatif_random10000", lambda: bench_whatif(random_mix(10000, seed=1))),
+        ]
+    return suite
+
+
+# -------------------------
+# Runner
+# -------------------------
+def measure(fn, repeat):
+    # The generator prints progress; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            quality = fn()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"time_s": min(times), "peak_MB": peak / 2**20, "quality": quality}
+
+
+def compare(name, result, base, time_tol, mem_tol, time_floor=0.02, mem_floor=1.0):
+    # Absolute floors keep millisecond cases and tiny heaps from flagging on noise
+    problems = []
+    if result["time_s"] > max(base["time_s"] * (1 + time_tol), base["time_s"] + time_floor):
+        problems.append(f"time {result['time_s']:.3f}s vs baseline {base['time_s']:.3f}s")
+    if result["peak_MB"] > max(base["peak_MB"] * (1 + mem_tol), base["peak_MB"] + mem_floor):
+        problems.append(f"peak {result['peak_MB']:.1f} MB vs baseline {base['peak_MB']:.1f} MB")
+    if result["quality"] > base["quality"] * (1 + 1e-9):
+        problems.append(f"quality {result['quality']:.6g} vs baseline {base['quality']:.6g}")
+    return [f"{name}: {p}" for p in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CHARM toolchain benchmarks")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="Skip the 10,000-layer cases")
+    parser.add_argument("--cases", default=None, help="Only run cases whose name contains this substring")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument("--time_tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument("--mem_tolerance", type=float, default=0.25, help="Allowed relative peak-memory growth")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    results, regressions = {}, []
+
+    print(f"{'case':40s} {'time (s)':>10s} {'peak (MB)':>10s} {'quality':>14s}  baseline")
+    for name, fn in cases(args.quick):
+        if args.cases and args.cases not in name:
+            continue
+        result = measure(fn, max(1, args.repeat))
+        results[name] = result
+        base = baseline.get(name)
+        if base is None:
+            status = "new"
+        else:
+            problems = compare(name, result, base, args.time_tolerance, args.mem_tolerance)
+            regressions += problems
+            status = "REGRESSED" if problems else f"ok ({result['time_s'] / max(base['time_s'], 1e-9):.2f}x time)"
+        print(f"{name:40s} {result['time_s']:10.3f} {result['peak_MB']:10.1f} {result['quality']:14.6g}  {status}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline updated: {baseline_path}")
+        return 0
+
+    if regressions:
+        print("\n!!! PERFORMANCE REGRESSION !!!")
+        for problem in regressions:
+            print(f"  {problem}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,23 @@ Usage:
 
 import json
 import math
+import re
 from pathlib import Path
 from jinja2 import Template
+import abc
 import argparse
+import functools
+import random
+import resource
 import time
+import tracemalloc
 
 # --- Configuration ---
 PROJECT_ROOT = Path(__file__).parent.resolve()
 KERNEL_DIR = PROJECT_ROOT / "kernels"
 INCLUDE_DIR = PROJECT_ROOT / "include" / "kernel"
+HOST_INCLUDE_DIR = PROJECT_ROOT / "include" / "host"
+SCRIPT_DIR = PROJECT_ROOT / "scripts"
 DESIGN_DIR = PROJECT_ROOT / "design_space"
 MODEL_DIR = PROJECT_ROOT / "models"
 
@@ -27,49 +35,365 @@ HARDWARE_CONSTRAINTS = {
     "total_hbm_channels": 32,
     "hbm_bandwidth": 460e9,
     "hbm_bw_per_channel": 460e9 / 32,  # Byte/s per channel
+    "hbm_channel_bytes": 8 * 2**30 // 32,  # 8 GB HBM, 256 MB per pseudo-channel
     "dsp_frequency": 300e6,
 }
 
+# --- Per-SLR budgets: the U50 has two SLRs, HBM hangs off SLR0 next to the shell ---
+SLR_CONSTRAINTS = [
+    {"name": "SLR0", "dsp": 2664, "bram": 1152, "uram": 160},
+    {"name": "SLR1", "dsp": 3288, "bram": 1536, "uram": 160},
+]
+# Derating for a CU whose HBM traffic (or own logic) crosses an SLR boundary
+SLR_CROSSING_PENALTY = {
+    "bandwidth": 0.85,
+    "fmax": 0.9,
+}
+
+# --- Host link between cards (PCIe Gen3 x16, effective) ---
+PCIE_LINK = {
+    "bandwidth": 12e9,  # Byte/s
+    "latency": 5e-6,    # s per transfer
+}
+
+# Bytes per element and HLS C type for each supported datatype
+DTYPES = {
+    "fp32": {"bytes": 4, "ctype": "float"},
+    "fp16": {"bytes": 2, "ctype": "half"},
+}
+
+# Loop orders: which operand stays on chip while the others stream
+#   output_stationary: ti -> tj -> tk, C tile accumulates on chip; A and B re-read per tile
+#   weight_stationary: tj -> tp -> ti -> tk, a PANEL_TILES*TILE_K deep B panel is read once and
+#                      held while every A row tile streams past; C accumulates on chip per panel
+#   input_stationary : ti -> tp -> tj -> tk, the same with an A panel held and B streamed
+# With K within one panel, the held operand is read exactly once and C written once; longer
+# K round-trips C partial sums through HBM once per extra panel.
+DATAFLOWS = ("output_stationary", "weight_stationary", "input_stationary")
+PANEL_TILES = 4
+
+# Row-wise ops a fused GEMM chain can apply to its on-chip intermediate (kernel epilogue codes)
+EPILOGUES = {"relu": 1, "gelu": 2, "softmax": 3}
+
+# --- Kernel clocks: the U50 shell offers two kernel clock domains, up to 500 MHz ---
+CLOCK_CONSTRAINTS = {
+    "max_frequency": 500e6,
+    "step": 10e6,          # MMCM granularity we round predictions down to
+    "max_domains": 2,
+}
+
+
+# -------------------------
+# Tracing: opt-in phase spans and counters (Chrome trace-event JSON)
+# -------------------------
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, args):
+        self.tracer, self.name, self.args = tracer, name, args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """
+    Spans and counters for the generator's phases, written as Chrome
+    trace-event JSON (chrome://tracing, Perfetto). Disabled by default: span()
+    then hands back a shared no-op context manager and count() returns at
+    once, so instrumented code pays one attribute check. When enabled, the
+    process peak RSS is sampled at the end of every span; enable(memory=True)
+    adds tracemalloc's Python heap figures, which slows the traced run
+    several-fold on large models.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.events = []
+        self.counters = {}
+
+    def enable(self, memory=False):
+        self.enabled = True
+        self.memory = memory
+        self.events, self.counters = [], {}
+        self.origin = time.perf_counter()
+        if memory:
+            tracemalloc.start()
+
+    def peak_bytes(self):
+        """Peak Python heap under tracemalloc, otherwise the process peak RSS."""
+        if self.memory:
+            return tracemalloc.get_traced_memory()[1]
+        # ru_maxrss is in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+        self.events.append({"name": name, "ph": "C", "ts": self.timestamp(time.perf_counter()),
+                            "pid": 0, "args": {name: self.counters[name]}})
+
+    def complete(self, name, start, end, args):
+        self.events.append({"name": name, "cat": name.split(".")[0], "ph": "X",
+                            "ts": self.timestamp(start), "dur": round((end - start) * 1e6, 3),
+                            "pid": 0, "tid": 0, "args": args})
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            memory = {"current_MB": round(current / 2**20, 3), "peak_MB": round(peak / 2**20, 3)}
+        else:
+            memory = {"peak_rss_MB": round(self.peak_bytes() / 2**20, 3)}
+        self.events.append({"name": "memory", "ph": "C", "ts": self.timestamp(end), "pid": 0, "args": memory})
+
+    def timestamp(self, t):
+        return round((t - self.origin) * 1e6, 3)
+
+    def write(self, path):
+        peak = self.peak_bytes()
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": self.events,
+                "displayTimeUnit": "ms",
+                "otherData": {"counters": self.counters, "peak_memory_bytes": peak,
+                              "peak_memory_source": "tracemalloc" if self.memory else "rss"},
+            }, f)
+        return peak
+
+
+TRACER = Tracer()
+
+
+def traced(name):
+    """Run the decorated function inside a TRACER span named `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fn(*args, **kwargs)
+            with TRACER.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@traced("model.load")
+def load_model(model_file):
+    with open(model_file) as f:
+        return json.load(f)
+
+
+def partition_factors(design):
+    """Cyclic partition factors of local_A (dim 1) and local_B (dim 2)."""
+    if "pe" in design:
+        return tuple(design["pe"])
+    factor = min(32, max(1, design["tile"][0] // 4)) if design.get("type", "large") == "large" else 1
+    return factor, factor
+
+
+def memory_type(design):
+    return "uram" if design.get("type", "large") == "large" else "bram"
+
+
+def buffer_storage(design):
+    """
+    (local_A, local_B) storage, as calculate_memory counts it. Both are the
+    streamed tiles in every loop order, so BRAM; the stationary operand (the
+    B or A panel, and local_C) is bound to URAM in the template itself.
+    """
+    return "bram", "bram"
+
+
+# -------------------------
+# Fmax prediction
+# -------------------------
+class FmaxModel:
+    """
+    Predicts the clock a kernel closes at after implementation. Starts from
+    the HLS estimate of an uncongested kernel (base_fmax) and derates for
+    the knobs that drive routing congestion: partition factor, PE array size,
+    URAM vs BRAM buffers and device utilisation. base_fmax defaults to the
+    mm_small estimate in _x/reports and can be recalibrated with calibrate().
+    The derate coefficients are uncalibrated assumptions: the available
+    reports cover one small kernel with no DSPs, which cannot pin them down,
+    so predicted clocks are only as good as those guesses.
+    """
+    ASSUMED = ("route_derate", "partition_coeff", "pe_coeff", "uram_factor", "util_coeff", "util_knee")
+
+    def __init__(self, base_fmax=411e6, route_derate=0.85, partition_coeff=0.03,
+                 pe_coeff=0.04, uram_factor=0.93, util_coeff=0.3, util_knee=0.6):
+        self.base_fmax = base_fmax
+        self.calibrated_from = 0
+        self.route_derate = route_derate
+        self.partition_coeff = partition_coeff
+        self.pe_coeff = pe_coeff
+        self.uram_factor = uram_factor
+        self.util_coeff = util_coeff
+        self.util_knee = util_knee
+
+    def congestion_factor(self, partition, dsp, mem_type, utilisation):
+        factor = 1.0 - self.partition_coeff * math.log2(max(1, partition))
+        factor *= 1.0 - self.pe_coeff * math.log2(max(1.0, dsp / 256.0))
+        if mem_type == "uram":
+            factor *= self.uram_factor
+        factor *= 1.0 - self.util_coeff * max(0.0, utilisation - self.util_knee)
+        return max(0.1, factor)
+
+    def predict(self, design, constraints):
+        utilisation = max(design["dsp"] / constraints["total_dsp"],
+                          design.get("bram_blocks", 0) / constraints["total_bram"],
+                          design.get("uram_blocks", 0) / constraints["total_uram"])
+        fmax = self.base_fmax * self.route_derate * self.congestion_factor(
+            max(partition_factors(design)), design["dsp"], memory_type(design), utilisation)
+        if design.get("slr_crossing"):
+            fmax *= SLR_CROSSING_PENALTY["fmax"]
+        return fmax
+
+    @traced("fmax.calibrate")
+    def calibrate(self, report_dir, constraints):
+        """
+        Refit base_fmax from v++ system_estimate_*.xtxt reports: each kernel's
+        estimated frequency divided by the congestion factor implied by its
+        reported area. Only base_fmax is fitted; the derates stay as assumed.
+        Returns the number of kernels used.
+        """
+        samples = []
+        for path in sorted(Path(report_dir).glob("*/system_estimate_*.xtxt")):
+            estimate = self.parse_system_estimate(path.read_text(errors="ignore"))
+            for kernel, info in estimate.items():
+                if "fmax" not in info:
+                    continue
+                utilisation = max(info["dsp"] / constraints["total_dsp"],
+                                  info["bram"] / constraints["total_bram"],
+                                  info["uram"] / constraints["total_uram"])
+                # Reports carry no partition factor, so assume the uncongested case
+                factor = self.congestion_factor(1, info["dsp"], "uram" if info["uram"] else "bram", utilisation)
+                samples.append(info["fmax"] / factor)
+        if samples:
+            self.base_fmax = sum(samples) / len(samples)
+        self.calibrated_from = len(samples)
+        return len(samples)
+
+    def summary(self):
+        """What the predicted clocks rest on, for the written configuration."""
+        return {
+            "base_fmax_hz": self.base_fmax,
+            "base_calibrated_from_reports": self.calibrated_from,
+            "uncalibrated_assumptions": {name: getattr(self, name) for name in self.ASSUMED},
+        }
+
+    @staticmethod
+    def parse_system_estimate(text):
+        kernels = {}
+        section = None
+        for line in text.splitlines():
+            if line.startswith("Timing Information"):
+                section = "timing"
+            elif line.startswith("Latency Information"):
+                section = None
+            elif line.startswith("Area Information"):
+                section = "area"
+            fields = line.split()
+            if section == "timing" and len(fields) == 5 and re.match(r"^[\d.]+$", fields[4]):
+                cu, kernel, module = fields[:3]
+                if module == kernel:
+                    kernels.setdefault(kernel, {"dsp": 0, "bram": 0, "uram": 0})["fmax"] = float(fields[4]) * 1e6
+            elif section == "area" and len(fields) == 8 and fields[3].isdigit() and fields[2] == fields[1]:
+                # The top-level module row already includes its sub-modules
+                info = kernels.setdefault(fields[1], {"dsp": 0, "bram": 0, "uram": 0})
+                info["dsp"] = int(fields[5])
+                info["bram"] = int(fields[6])
+                info["uram"] = int(fields[7])
+        return kernels
+
+
 # -------------------------
 # CDSE: 
 # -------------------------
 class CDSE:
-    def __init__(self, hardware_constraints):
+    def __init__(self, hardware_constraints, fmax_model=None):
         self.constraints = hardware_constraints
+        self.fmax_model = fmax_model or FmaxModel()
 
+    @traced("cdse.explore")
     def explore_design_space(self, M, K, N, acc_type="large"):
+        candidates = self.design_points(acc_type)
         designs = []
-
+        for design in candidates:
+            if self.is_feasible(design):
+                design = dict(design)
+                # Rank at the clock the design is predicted to close at, not the target
+                throughput, efficiency = self.estimate_throughput(M, K, N, design["dsp"],
+                                                                  self.design_frequency(design))
+                design["throughput_GFLOPS"] = round(throughput, 2)
+                design["efficiency"] = round(efficiency, 3)
+                designs.append(design)
+
+        TRACER.count("design_points_evaluated", len(candidates))
+        TRACER.count("design_points_pruned", len(candidates) - len(designs))
+        return self.rank_designs(M, K, N, designs)
+
+    def rank_designs(self, M, K, N, designs, latency=None):
+        """
+        Best first for an M x K x N shape. Peak throughput ties across loop
+        orders, so rank by predicted latency on this shape, then by off-chip
+        traffic so compute-bound shapes still get the order that reuses best.
+        """
+        latency = latency or self.estimate_layer_latency
+        return sorted(designs, key=lambda x: (latency(M, K, N, x),
+                                              self.calculate_traffic(M, K, N, x["tile"], x["dataflow"]),
+                                              -x["throughput_GFLOPS"]))
+
+    def is_feasible(self, design):
+        c = self.constraints
+        return (design["dsp"] <= c["total_dsp"] and
+                design["hbm_channels"] <= c["total_hbm_channels"] and
+                design["bram_blocks"] <= c["total_bram"] and
+                design["uram_blocks"] <= c["total_uram"])
+
+    def design_points(self, acc_type="large"):
+        """Every (tile, loop order) candidate of `acc_type` with its resource needs, feasible or not."""
+        points = []
         if acc_type == "large":
             tile_candidates = [(256, 256, 128), (512, 512, 256), (1024, 1024, 512)]
+            dataflows = DATAFLOWS
         else:
             tile_candidates = [(64, 64, 64), (128, 128, 64), (256, 256, 128)]
+            # The small kernel streams A/B straight through, it has no tile loop nest to reorder
+            dataflows = ("output_stationary",)
 
-        for tile_m, tile_n, tile_k in tile_candidates:
+        for (tile_m, tile_n, tile_k), dataflow in ((t, d) for t in tile_candidates for d in dataflows):
             dsp_required = self.calculate_dsp(tile_m, tile_n, tile_k, acc_type)
-            hbm_channels = self.calculate_hbm_channels(tile_m, tile_n, tile_k)
-            mem_required = self.calculate_memory(tile_m, tile_n, tile_k)
-
-            if (dsp_required <= self.constraints["total_dsp"] and
-                hbm_channels <= self.constraints["total_hbm_channels"] and
-                mem_required["bram"] <= self.constraints["total_bram"] and
-                mem_required["uram"] <= self.constraints["total_uram"]):
-
-                throughput, efficiency = self.estimate_throughput(M, K, N, dsp_required)
-
-                designs.append({
-                    "type": acc_type,
-                    # tuple
-                    "tile": (tile_m, tile_n, tile_k),
-                    "dsp": dsp_required,
-                    "bram_blocks": mem_required["bram"],
-                    "uram_blocks": mem_required["uram"],
-                    "hbm_channels": hbm_channels,
-                    "throughput_GFLOPS": round(throughput, 2),
-                    "efficiency": round(efficiency, 3)
-                })
-
-        return sorted(designs, key=lambda x: x["throughput_GFLOPS"], reverse=True)
+            mem_required = self.calculate_memory(tile_m, tile_n, tile_k, dataflow=dataflow)
+            points.append({
+                "type": acc_type,
+                # tuple
+                "tile": (tile_m, tile_n, tile_k),
+                "dataflow": dataflow,
+                "dsp": dsp_required,
+                "bram_blocks": mem_required["bram"],
+                "uram_blocks": mem_required["uram"],
+                "hbm_channels": self.calculate_hbm_channels(tile_m, tile_n, tile_k, dataflow, dsp_required),
+            })
+        return points
 
     def calculate_dsp(self, tile_m, tile_n, tile_k, acc_type):
         if acc_type == "large":
@@ -77,37 +401,178 @@ class CDSE:
         else:
             return min(512, (tile_m * tile_n) // 32)
 
-    def calculate_hbm_channels(self, tile_m, tile_n, tile_k):
-        # A very simple bandwidth estimate: the amount of data A/B/C needs to be moved per tile
-        data_volume_bytes = (tile_m * tile_k + tile_k * tile_n + tile_m * tile_n) * 4
-        # Assume that the computation time per tile is proportional to the number of MACs per tile / DSP_throughput
-        ops_per_tile = 2 * tile_m * tile_n * tile_k
-
-        denom = max(1, tile_m * tile_n)
+    def calculate_hbm_channels(self, tile_m, tile_n, tile_k, dataflow="output_stationary", dsp=None, elem_bytes=4):
+        # Bytes moved per tile step: the held panel is not re-fetched, and the panel orders
+        # move a C tile in and out once per PANEL_TILES steps
+        a, b, c = tile_m * tile_k, tile_k * tile_n, tile_m * tile_n
+        data_volume_bytes = {
+            "output_stationary": a + b + c,
+            "weight_stationary": a + 2 * c / PANEL_TILES,
+            "input_stationary": b + 2 * c / PANEL_TILES,
+        }[dataflow] * elem_bytes
+        # A tile step takes tile MACs / DSPs cycles; without a DSP count assume one output per cycle
+        denom = max(1, tile_m * tile_n * tile_k // dsp if dsp else tile_m * tile_n)
         required_bw = (data_volume_bytes * self.constraints["dsp_frequency"]) / denom
         per_ch_bw = self.constraints.get("hbm_bw_per_channel") or (self.constraints["hbm_bandwidth"]/self.constraints["total_hbm_channels"])
         channels = int(math.ceil(required_bw / per_ch_bw))
         return max(1, min(self.constraints["total_hbm_channels"], channels))
 
-    def calculate_memory(self, tile_m, tile_n, tile_k):
-        bram_bytes = (tile_m * tile_k + tile_k * tile_n) * 4
-        uram_bytes = (tile_m * tile_n) * 4
+    def calculate_memory(self, tile_m, tile_n, tile_k, elem_bytes=4, dataflow="output_stationary"):
+        # The buffers the kernel template allocates for the loop order: the C tile and any
+        # held panel in URAM, the streamed tiles in BRAM
+        a, b, c = tile_m * tile_k, tile_k * tile_n, tile_m * tile_n
+        stationary, streamed = {
+            "output_stationary": (c, a + b),
+            "weight_stationary": (PANEL_TILES * b + c, a),
+            "input_stationary": (PANEL_TILES * a + c, b),
+        }[dataflow]
+        bram_bytes = streamed * elem_bytes
+        uram_bytes = stationary * elem_bytes
         return {
             "bram": int(math.ceil(bram_bytes / 4608.0)),   # BRAM~4.5KB
             "uram": int(math.ceil(uram_bytes / 36864.0))  # URAM~36KB
         }
 
-    def estimate_throughput(self, M, K, N, dsp_count):
+    def calculate_traffic(self, M, K, N, tile, dataflow="output_stationary", stream_in=False, stream_out=False):
+        """Off-chip elements moved for one M x K x N GEMM under a loop order."""
+        tile_m, tile_n, tile_k = tile
+        tiles_m = int(math.ceil(M / tile_m))
+        tiles_n = int(math.ceil(N / tile_n))
+        panels = int(math.ceil(K / (PANEL_TILES * tile_k)))
+        if dataflow == "weight_stationary":
+            # B read once; A re-read per column tile; C partial sums read back for every panel but the first
+            a, b, c = M * K * tiles_n, K * N, M * N * (2 * panels - 1)
+        elif dataflow == "input_stationary":
+            # A read once; B re-read per row tile
+            a, b, c = M * K, K * N * tiles_m, M * N * (2 * panels - 1)
+        else:
+            # A streamed once per column tile, B once per row tile, C written once
+            a, b, c = M * K * tiles_n, K * N * tiles_m, M * N
+        return (0 if stream_in else a) + b + (0 if stream_out else c)
+
+    def estimate_throughput(self, M, K, N, dsp_count, frequency=None):
         # Peak approximation: 2 MACs (FMA) per DSP per cycle * frequency
-        peak = dsp_count * 2 * self.constraints["dsp_frequency"]  # FLOP/s
+        peak = dsp_count * 2 * (frequency or self.constraints["dsp_frequency"])  # FLOP/s
         throughput = peak / 1e9  # GFLOPS
         efficiency = 1.0  # assuming 100% efficiency for simplicity
         return throughput, efficiency
 
+    def estimate_layer_latency(self, M, K, N, design, stream_in=False, stream_out=False):
+        """
+        Seconds to run one M x K x N GEMM on `design` (roofline of compute vs HBM).
+        stream_in / stream_out drop the A read / C write when they arrive or
+        leave over a kernel-to-kernel AXI stream instead of HBM.
+        """
+        cost = self.layer_cost(M, K, N, design, stream_in, stream_out)
+        return max(cost["compute_s"], cost["memory_s"])
+
+    def layer_cost(self, M, K, N, design, stream_in=False, stream_out=False):
+        """Roofline terms of one GEMM on `design`: padded MACs, HBM bytes and the time each takes."""
+        tile_m, tile_n, tile_k = design["tile"]
+        elem_bytes = DTYPES[design.get("dtype", "fp32")]["bytes"]
+
+        # The kernel always runs whole tiles, so padded work is what costs time
+        tiles_m = int(math.ceil(M / tile_m))
+        tiles_n = int(math.ceil(N / tile_n))
+        tiles_k = int(math.ceil(K / tile_k))
+        padded_macs = (tiles_m * tile_m) * (tiles_n * tile_n) * (tiles_k * tile_k)
+        compute_s = padded_macs / (max(1, design["dsp"]) * self.design_frequency(design))
+
+        traffic_bytes = self.calculate_traffic(M, K, N, design["tile"], design.get("dataflow", "output_stationary"),
+                                               stream_in, stream_out) * elem_bytes
+        memory_s = traffic_bytes / self.hbm_bandwidth(design)
+
+        return {"padded_macs": padded_macs, "traffic_bytes": traffic_bytes,
+                "compute_s": compute_s, "memory_s": memory_s}
+
+    def hbm_bandwidth(self, design):
+        """Bytes/s the design's HBM channels deliver, derated when it crosses an SLR."""
+        hbm = design["hbm_channels"]
+        hbm_count = hbm if isinstance(hbm, int) else hbm.get("count", 1)
+        per_ch_bw = self.constraints.get("hbm_bw_per_channel") or (self.constraints["hbm_bandwidth"]/self.constraints["total_hbm_channels"])
+        if design.get("slr_crossing"):
+            per_ch_bw *= SLR_CROSSING_PENALTY["bandwidth"]
+        return max(1, hbm_count) * per_ch_bw
+
+    def estimate_fused_latency(self, M, K, N1, N2, design):
+        """
+        Seconds to run (A x B1) x B2 as one fused kernel on `design`. Each
+        TILE_M row block of the M x N1 intermediate stays on chip, so it is
+        never written to HBM or read back.
+        """
+        tile_m, tile_n, tile_k = design["tile"]
+        elem_bytes = DTYPES[design.get("dtype", "fp32")]["bytes"]
+
+        def pad(x, t):
+            return int(math.ceil(x / t)) * t
+
+        tiles_m = int(math.ceil(M / tile_m))
+        padded_macs = tiles_m * tile_m * (pad(N1, tile_n) * pad(K, tile_k) + pad(N2, tile_n) * pad(N1, tile_k))
+        compute_s = padded_macs / (max(1, design["dsp"]) * self.design_frequency(design))
+
+        # A once per intermediate column tile, both weights once per row block, only the final C written
+        traffic = M * K * int(math.ceil(N1 / tile_n)) + (K * N1 + N1 * N2) * tiles_m + M * N2
+        memory_s = traffic * elem_bytes / self.hbm_bandwidth(design)
+
+        return max(compute_s, memory_s)
+
+    def fusion_uram_blocks(self, design, width):
+        """URAM blocks for the TILE_M x width intermediate row block of a fused chain."""
+        if width <= 0:
+            return 0
+        tile_m, tile_n, tile_k = design["tile"]
+        elem_bytes = DTYPES[design.get("dtype", "fp32")]["bytes"]
+        padded = int(math.ceil(width / math.lcm(tile_n, tile_k))) * math.lcm(tile_n, tile_k)
+        return int(-(-tile_m * padded * elem_bytes // 36864))
+
+    def predict_fmax(self, design):
+        return self.fmax_model.predict(design, self.constraints)
+
+    def design_frequency(self, design):
+        """Clock the design runs at (Hz): its assigned clock domain, else the predicted Fmax."""
+        if "clock_hz" in design:
+            return design["clock_hz"]
+        step = CLOCK_CONSTRAINTS["step"]
+        fmax = min(self.predict_fmax(design), CLOCK_CONSTRAINTS["max_frequency"])
+        return max(step, math.floor(fmax / step) * step)
+
 
 # -------------------------
 # CDAC:
 # -------------------------
+def layer_name(layer, index):
+    return layer.get("name", f"layer{index}")
+
+
+def spans_slrs(design, slrs=SLR_CONSTRAINTS):
+    """True when one CU of `design` is too big for any single SLR."""
+    replicas = design.get("replicas", 1)
+    return not any(design["dsp"] // replicas <= s["dsp"] and design["bram_blocks"] // replicas <= s["bram"]
+                   and design["uram_blocks"] // replicas <= s["uram"] for s in slrs)
+
+
+def stream_order(acc, cols, port):
+    """
+    Order a kernel writes C (port "C") or reads A (port "A") in, for a matrix
+    `cols` wide: "row" for plain row-major, else the (rows, cols) tile it
+    walks row-major tile by tile.
+    """
+    if acc["type"] != "large":
+        return "row"
+    tile_m, tile_n, tile_k = acc["tile"]
+    if port == "C":
+        block = tile_n
+    elif acc.get("dataflow", "output_stationary") == "input_stationary":
+        block = PANEL_TILES * tile_k
+    else:
+        block = tile_k
+    return "row" if cols <= block else (tile_m, block)
+
+
+def fused_layers(fusions):
+    return {f[role] for f in fusions for role in ("producer", "consumer")}
+
+
 class CDAC:
     def __init__(self, cdse):
         self.cdse = cdse
@@ -118,17 +583,12 @@ class CDAC:
           - "strict": strcitly restricted by resources
           - "demo"  : force create a small kernel for demo
         """
-        with open(model_file) as f:
-            model = json.load(f)
+        model = load_model(model_file)
+        return self.compose_model(model, num_accs, mode)
 
-        large_kernels, small_kernels = [], []
-        for layer in model["layers"]:
-            if layer.get("type") == "mm":
-                ops = layer["M"] * layer["K"] * layer["N"]
-                if ops > 1e6:
-                    large_kernels.append(layer)
-                else:
-                    small_kernels.append(layer)
+    @traced("cdac.compose")
+    def compose_model(self, model, num_accs=2, mode="strict"):
+        large_kernels, small_kernels = self.group_layers(model["layers"])
 
         accelerators = []
 
@@ -159,13 +619,35 @@ class CDAC:
 
         
         self.assign_hbm_channels(accelerators)
+        layers = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+        mapping = self.map_layers(layers, accelerators)
+        fusions = self.plan_fusion(model["layers"], accelerators, mapping)
+        self.assign_slrs(accelerators)
+        self.assign_clocks(accelerators)
+
+        streams = self.plan_streams(layers, accelerators, mapping, fused_layers(fusions))
 
         return {
             "accelerators": accelerators,
             "model": model.get("name", "unknown"),
-            "total_throughput": sum(acc["throughput_GFLOPS"] for acc in accelerators)
+            "total_throughput": sum(acc["throughput_GFLOPS"] for acc in accelerators),
+            "streams": streams,
+            "fusions": fusions,
+            "hbm_bytes_saved": sum(s["hbm_bytes_saved"] for s in streams + fusions)
         }
 
+    def group_layers(self, layers):
+        """GEMM layers split into the large- and small-kernel groups by operation count."""
+        large_kernels, small_kernels = [], []
+        for layer in layers:
+            if layer.get("type") == "mm":
+                ops = layer["M"] * layer["K"] * layer["N"]
+                if ops > 1e6:
+                    large_kernels.append(layer)
+                else:
+                    small_kernels.append(layer)
+        return large_kernels, small_kernels
+
     def get_average_size(self, kernels):
         n = max(1, len(kernels))
         return {
@@ -174,6 +656,7 @@ class CDAC:
             "N": sum(k["N"] for k in kernels) // n
         }
 
+    @traced("cdac.assign_hbm")
     def assign_hbm_channels(self, accelerators):
         next_channel = 0
         for acc in accelerators:
@@ -189,10 +672,1427 @@ class CDAC:
             acc["hbm_channels"]["count"] = max(1, min(channels_needed, self.cdse.constraints["total_hbm_channels"] - next_channel))
             next_channel += acc["hbm_channels"]["count"]
 
+    @traced("cdac.assign_slrs")
+    def assign_slrs(self, accelerators, slrs=SLR_CONSTRAINTS):
+        """
+        Place every compute unit on an SLR. Bandwidth-hungry accelerators go
+        first so their CUs land on SLR0 next to HBM. A CU placed on SLR1, or too
+        big for any single SLR, crosses an SLR boundary; its accelerator is
+        marked slr_crossing and derated. A CU spanning both SLRs takes its
+        resources from each but gets no SLR constraint (None), since no single
+        slr= line can hold it. A CU that does not fit in what is left of all
+        SLRs together also gets None, plus a warning, leaving placement to the
+        linker.
+        """
+        free = [dict(slr) for slr in slrs]
+        order = sorted(accelerators, key=lambda a: a["hbm_channels"]["count"], reverse=True)
+        for acc in order:
+            replicas = acc.get("replicas", 1)
+            acc["slr"], acc["slr_crossing"] = [], False
+            for _ in range(replicas):
+                need = {"dsp": acc["dsp"] // replicas,
+                        "bram": acc["bram_blocks"] // replicas,
+                        "uram": acc["uram_blocks"] // replicas}
+                slr = next((s for s in free if all(need[r] <= s[r] for r in need)), None)
+                if slr is None and any(need[r] > sum(s[r] for s in free) for r in need):
+                    print(f"WARNING: {kernel_name(acc)} CU {len(acc['slr']) + 1} does not fit the free SLR "
+                          f"resources, leaving it unconstrained")
+                    acc["slr_crossing"] = True
+                    acc["slr"].append(None)
+                    continue
+                if slr is None:
+                    acc["slr_crossing"] = True
+                    for s in free:
+                        for r in need:
+                            taken = min(need[r], s[r])
+                            s[r] -= taken
+                            need[r] -= taken
+                    acc["slr"].append(None)
+                    continue
+                acc["slr_crossing"] |= slr is not free[0]
+                for r in need:
+                    slr[r] -= need[r]
+                acc["slr"].append(slr["name"])
+
+    @traced("cdac.assign_clocks")
+    def assign_clocks(self, accelerators, max_domains=CLOCK_CONSTRAINTS["max_domains"]):
+        """
+        Give each accelerator the clock it is predicted to close at. When that
+        needs more domains than the shell offers, the two closest clocks are
+        merged onto the slower one until it fits. Throughput is restated at
+        the assigned clock.
+        """
+        clocks = {kernel_name(acc): self.cdse.design_frequency(acc) for acc in accelerators}
+        domains = sorted(set(clocks.values()))
+        while len(domains) > max(1, max_domains):
+            i = min(range(len(domains) - 1), key=lambda j: domains[j + 1] - domains[j])
+            del domains[i + 1]
+        for acc in accelerators:
+            acc["clock_hz"] = max([d for d in domains if d <= clocks[kernel_name(acc)]] or [domains[0]])
+            throughput, _ = self.cdse.estimate_throughput(0, 0, 0, acc["dsp"], acc["clock_hz"])
+            acc["throughput_GFLOPS"] = round(throughput, 2)
+
+    @traced("cdac.map_layers")
+    def map_layers(self, layers, accelerators):
+        """Index of the fastest accelerator for each layer."""
+        if not accelerators:
+            return []
+        return [min(range(len(accelerators)),
+                    key=lambda i: self.cdse.estimate_layer_latency(l["M"], l["K"], l["N"], accelerators[i]))
+                for l in layers]
+
+    def layer_assignment(self, layers, acc_config):
+        """
+        Accelerator index per layer: the searched layer_map if present, else the
+        fastest. Both layers of a fused chain run on the fused kernel's host.
+        """
+        accelerators = acc_config["accelerators"]
+        names = [kernel_name(acc) for acc in accelerators]
+        if "layer_map" in acc_config:
+            mapping = [names.index(entry["acc"]) for entry in acc_config["layer_map"]]
+        else:
+            mapping = self.map_layers(layers, accelerators)
+        index = {layer_name(l, i): i for i, l in enumerate(layers)}
+        for fusion in acc_config.get("fusions", []):
+            mapping[index[fusion["producer"]]] = mapping[index[fusion["consumer"]]] = names.index(fusion["acc"])
+        return mapping
+
+    def layer_graph(self, layers):
+        """
+        Producer -> consumer edges (indices into `layers`). Layers naming their
+        producers in "inputs" use those; otherwise consecutive layers are linked
+        when the producer's M x N output has the consumer's M x K input shape.
+        """
+        index = {layer_name(l, i): i for i, l in enumerate(layers)}
+        edges = []
+        for i, layer in enumerate(layers):
+            if "inputs" in layer:
+                edges.extend((index[name], i) for name in layer["inputs"] if name in index)
+            elif i > 0 and layers[i - 1]["M"] == layer["M"] and layers[i - 1]["N"] == layer["K"]:
+                edges.append((i - 1, i))
+        return edges
+
+    def gemm_chains(self, model_layers):
+        """
+        Back-to-back GEMM pairs a fused kernel can run, as (producer, consumer,
+        epilogue) with indices into the mm layers. The producer's output must
+        feed only the consumer and the consumer must have no other producer.
+        Non-mm layers right after the producer are allowed if they are a single
+        row-wise op from EPILOGUES, applied to the on-chip intermediate.
+        """
+        layers, ops_after = [], []
+        for layer in model_layers:
+            if layer.get("type") == "mm":
+                layers.append(layer)
+                ops_after.append([])
+            elif layers:
+                ops_after[-1].append(layer.get("type"))
+
+        edges = self.layer_graph(layers)
+        out_degree, in_degree = {}, {}
+        for p, c in edges:
+            out_degree[p] = out_degree.get(p, 0) + 1
+            in_degree[c] = in_degree.get(c, 0) + 1
+
+        chains = []
+        for p, c in edges:
+            ops = ops_after[p]
+            if out_degree[p] != 1 or in_degree[c] != 1:
+                continue
+            if len(ops) > 1 or any(op not in EPILOGUES for op in ops):
+                continue
+            chains.append((p, c, ops[0] if ops else None))
+        return chains
+
+    @traced("cdac.plan_fusion")
+    def plan_fusion(self, model_layers, accelerators, mapping):
+        """
+        Decide which GEMM chains run as one fused kernel. A chain is fused onto a
+        large, unreplicated accelerator when its TILE_M x N intermediate row
+        block fits in the URAM left under the budget and the fused latency is no
+        worse than running both layers on their own accelerators. The extra
+        URAM can lower the host's Fmax or push it across an SLR, so that cost
+        is charged for every other layer the host runs. Chains are taken
+        greedily by latency saved; the host's kernel gains the fused path and
+        `mapping` is updated so both layers run there.
+        """
+        layers = [layer for layer in model_layers if layer.get("type") == "mm"]
+        candidates = []
+        for p, c, epilogue in self.gemm_chains(model_layers):
+            prod, cons = layers[p], layers[c]
+            separate = (self.cdse.estimate_layer_latency(prod["M"], prod["K"], prod["N"], accelerators[mapping[p]])
+                        + self.cdse.estimate_layer_latency(cons["M"], cons["K"], cons["N"], accelerators[mapping[c]]))
+            for idx, acc in enumerate(accelerators):
+                if acc["type"] != "large" or acc.get("replicas", 1) > 1:
+                    continue
+                fused = self.cdse.estimate_fused_latency(prod["M"], prod["K"], prod["N"], cons["N"], acc)
+                if fused <= separate:
+                    candidates.append({"saved": separate - fused, "separate": separate,
+                                       "p": p, "c": c, "acc": idx, "epilogue": epilogue})
+
+        uram_free = self.cdse.constraints["total_uram"] - sum(acc["uram_blocks"] for acc in accelerators)
+        fusions, taken = [], set()
+        for cand in sorted(candidates, key=lambda x: (x["saved"], layers[x["p"]]["M"] * layers[x["p"]]["N"]),
+                           reverse=True):
+            p, c = cand["p"], cand["c"]
+            if p in taken or c in taken:
+                continue
+            acc = accelerators[cand["acc"]]
+            fused = acc.get("fused", {"width": 0, "epilogues": []})
+            width = max(fused["width"], layers[p]["N"])
+            extra = self.cdse.fusion_uram_blocks(acc, width) - self.cdse.fusion_uram_blocks(acc, fused["width"])
+            if extra > uram_free:
+                continue
+            trial = dict(acc, uram_blocks=acc["uram_blocks"] + extra)
+            # Outgrowing every single SLR forces the CU across the boundary
+            if spans_slrs(trial) and not spans_slrs(acc):
+                trial["slr_crossing"] = True
+            fused_s = self.cdse.estimate_fused_latency(layers[p]["M"], layers[p]["K"], layers[p]["N"],
+                                                       layers[c]["N"], trial)
+            if self.cdse.design_frequency(trial) != self.cdse.design_frequency(acc):
+                fused_s += sum(self.cdse.estimate_layer_latency(l["M"], l["K"], l["N"], trial)
+                               - self.cdse.estimate_layer_latency(l["M"], l["K"], l["N"], acc)
+                               for i, l in enumerate(layers) if mapping[i] == cand["acc"] and i not in (p, c))
+            if fused_s > cand["separate"]:
+                continue
+            cand["saved"] = cand["separate"] - fused_s
+            uram_free -= extra
+            acc["uram_blocks"] += extra
+            fused["width"] = width
+            if cand["epilogue"] and cand["epilogue"] not in fused["epilogues"]:
+                fused["epilogues"].append(cand["epilogue"])
+            acc["fused"] = fused
+            mapping[p] = mapping[c] = cand["acc"]
+            taken |= {p, c}
+            elem_bytes = DTYPES[acc.get("dtype", "fp32")]["bytes"]
+            fusions.append({
+                "producer": layer_name(layers[p], p),
+                "consumer": layer_name(layers[c], c),
+                "acc": kernel_name(acc),
+                "epilogue": cand["epilogue"],
+                # The intermediate is neither written nor read back
+                "hbm_bytes_saved": 2 * layers[p]["M"] * layers[p]["N"] * elem_bytes,
+                "latency_saved_s": cand["saved"],
+            })
+        return fusions
+
+    @traced("cdac.plan_streams")
+    def plan_streams(self, layers, accelerators, mapping, fused=()):
+        """
+        Pick producer/consumer pairs that run on different accelerators and can
+        hand C -> A over an AXI stream. Each kernel has one C_out and one A_in
+        port, so pairs are taken greedily by HBM traffic saved. A stream cannot
+        be replayed: the producer must be output-stationary (C written once) and
+        the consumer must read A once (input-stationary, or output-stationary
+        with N in one tile column), and the consumer's A tile order must match
+        the order the producer emits C in. Replicated kernels are skipped since
+        every CU would need its own stream_connect, and so are layers named in
+        `fused`, which already run inside a fused kernel. A streamed producer
+        never writes C to HBM, so it must feed only the one consumer.
+        """
+        edges = self.layer_graph(layers)
+        out_degree = {}
+        for p, _ in edges:
+            out_degree[p] = out_degree.get(p, 0) + 1
+
+        candidates = []
+        for p, c in edges:
+            src, dst = mapping[p], mapping[c]
+            if src == dst or out_degree[p] != 1:
+                continue
+            if layer_name(layers[p], p) in fused or layer_name(layers[c], c) in fused:
+                continue
+            src_acc, dst_acc = accelerators[src], accelerators[dst]
+            if src_acc.get("replicas", 1) > 1 or dst_acc.get("replicas", 1) > 1:
+                continue
+            prod, cons = layers[p], layers[c]
+            # Only output-stationary writes each C element exactly once
+            if src_acc.get("dataflow", "output_stationary") != "output_stationary":
+                continue
+            cons_dataflow = dst_acc.get("dataflow", "output_stationary")
+            if cons_dataflow == "weight_stationary":
+                continue
+            if cons_dataflow == "output_stationary" and cons["N"] > dst_acc["tile"][1]:
+                continue
+            if stream_order(src_acc, prod["N"], "C") != stream_order(dst_acc, cons["K"], "A"):
+                continue
+            elem_bytes = DTYPES[src_acc.get("dtype", "fp32")]["bytes"]
+            latency_saved = (
+                self.cdse.estimate_layer_latency(prod["M"], prod["K"], prod["N"], src_acc)
+                - self.cdse.estimate_layer_latency(prod["M"], prod["K"], prod["N"], src_acc, stream_out=True)
+                + self.cdse.estimate_layer_latency(cons["M"], cons["K"], cons["N"], dst_acc)
+                - self.cdse.estimate_layer_latency(cons["M"], cons["K"], cons["N"], dst_acc, stream_in=True)
+            )
+            candidates.append({
+                "producer": layer_name(prod, p),
+                "consumer": layer_name(cons, c),
+                "src": kernel_name(src_acc),
+                "dst": kernel_name(dst_acc),
+                # C is neither written by the producer nor read back by the consumer
+                "hbm_bytes_saved": 2 * prod["M"] * prod["N"] * elem_bytes,
+                "latency_saved_s": latency_saved,
+            })
+
+        streams, out_port, in_port = [], {}, {}
+        for cand in sorted(candidates, key=lambda x: x["hbm_bytes_saved"], reverse=True):
+            if out_port.get(cand["src"], cand["dst"]) != cand["dst"] or in_port.get(cand["dst"], cand["src"]) != cand["src"]:
+                continue
+            out_port[cand["src"]], in_port[cand["dst"]] = cand["dst"], cand["src"]
+            streams.append(cand)
+
+        for acc in accelerators:
+            if kernel_name(acc) in out_port:
+                acc["stream_out"] = out_port[kernel_name(acc)]
+            if kernel_name(acc) in in_port:
+                acc["stream_in"] = in_port[kernel_name(acc)]
+        return streams
+
+    @traced("cdac.compose_for_workload")
+    def compose_for_workload(self, model_file, trace_file, num_accs=2, objective="p99"):
+        """
+        Pick the large/small design combination that minimises expected or p99
+        request latency over the shape histogram of a request trace, rather
+        than the throughput of one static shape list.
+        """
+        model = load_model(model_file)
+        histogram = load_request_histogram(trace_file)
+        if not histogram["buckets"]:
+            raise ValueError(f"no usable requests (seq_len + batch) in {trace_file}")
+
+        candidates = {t: self.cdse.explore_design_space(1, 1, 1, t) for t in ("large", "small")}
+        combos = [[d] for t in candidates for d in candidates[t]]
+        if num_accs > 1:
+            combos += [[l, sm] for l in candidates["large"] for sm in candidates["small"]]
+
+        best = None
+        TRACER.count("design_points_evaluated", len(combos))
+        for combo in combos:
+            accelerators = [dict(d) for d in combo]
+            if not self.fits(accelerators):
+                TRACER.count("design_points_pruned")
+                continue
+            self.assign_hbm_channels(accelerators)
+            self.assign_slrs(accelerators)
+            self.assign_clocks(accelerators)
+            stats = self.workload_latency(model, accelerators, histogram)
+            if best is None or stats[objective] < best[1][objective]:
+                best = (accelerators, stats)
+
+        if best is None:
+            raise ValueError(f"no accelerator combination fits {self.cdse.constraints}")
+        accelerators, stats = best
+        layers = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+        streams = self.plan_streams(layers, accelerators, self.map_layers(layers, accelerators))
+        return {
+            "accelerators": accelerators,
+            "model": model.get("name", "unknown"),
+            "total_throughput": sum(acc["throughput_GFLOPS"] for acc in accelerators),
+            "streams": streams,
+            "hbm_bytes_saved": sum(s["hbm_bytes_saved"] for s in streams),
+            "workload": {
+                "trace": str(trace_file),
+                "objective": objective,
+                "requests": histogram["requests"],
+                "skipped": histogram["skipped"],
+                "mean_latency_s": stats["mean"],
+                "p99_latency_s": stats["p99"],
+                "buckets": stats["buckets"],
+            }
+        }
+
+    def fits(self, accelerators):
+        c = self.cdse.constraints
+        return (sum(a["dsp"] for a in accelerators) <= c["total_dsp"] and
+                sum(a["bram_blocks"] for a in accelerators) <= c["total_bram"] and
+                sum(a["uram_blocks"] for a in accelerators) <= c["total_uram"] and
+                sum(a["hbm_channels"] for a in accelerators) <= c["total_hbm_channels"])
+
+    def workload_latency(self, model, accelerators, histogram):
+        """Per-bucket request latency (layers run back to back on their fastest accelerator)."""
+        buckets = []
+        for (seq_len, batch), count in sorted(histogram["buckets"].items()):
+            latency = sum(min(self.cdse.estimate_layer_latency(l["M"], l["K"], l["N"], acc) for acc in accelerators)
+                          for l in scale_model_layers(model, seq_len, batch))
+            buckets.append({"seq_len": seq_len, "batch": batch, "count": count, "latency_s": latency})
+
+        total = sum(b["count"] for b in buckets)
+        mean = sum(b["latency_s"] * b["count"] for b in buckets) / total
+        seen, p99 = 0, buckets[-1]["latency_s"]
+        for b in sorted(buckets, key=lambda x: x["latency_s"]):
+            seen += b["count"]
+            if seen >= 0.99 * total:
+                p99 = b["latency_s"]
+                break
+        return {"mean": mean, "p99": p99, "buckets": buckets}
+
+    @traced("cdac.search")
+    def search_accelerators(self, model_file, num_accs=2, strategy="anneal",
+                            max_evals=None, time_limit=None, seed=0):
+        """
+        Heuristic search over the joint space of `num_accs` accelerators and the
+        layer mapping, using the CDSE cost model as fitness. Use this instead of
+        compose_accelerators when the space is too large to enumerate.
+        """
+        model = load_model(model_file)
+
+        layers = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+        space = JointDesignSpace(self.cdse, layers, num_accs)
+        searcher = SEARCH_STRATEGIES[strategy](seed=seed)
+        result = searcher.run(space, SearchBudget(max_evals, time_limit))
+        if result["point"] is None:
+            raise ValueError(f"{strategy} search found no design that fits the device after "
+                             f"{result['evaluations']} evaluations; raise --max_evals/--time_budget")
+        accelerators, layer_map = space.to_accelerators(result["point"])
+        self.assign_hbm_channels(accelerators)
+        names = [kernel_name(acc) for acc in accelerators]
+        mapping = [names.index(e["acc"]) for e in layer_map]
+        fusions = self.plan_fusion(model["layers"], accelerators, mapping)
+        self.assign_slrs(accelerators)
+        self.assign_clocks(accelerators)
+        for entry, layer, idx in zip(layer_map, layers, mapping):
+            entry["acc"] = names[idx]
+            entry["latency_s"] = self.cdse.estimate_layer_latency(layer["M"], layer["K"], layer["N"], accelerators[idx])
+        streams = self.plan_streams(layers, accelerators, mapping, fused_layers(fusions))
+
+        return {
+            "accelerators": accelerators,
+            "model": model.get("name", "unknown"),
+            "total_throughput": sum(acc["throughput_GFLOPS"] for acc in accelerators),
+            "layer_map": layer_map,
+            "streams": streams,
+            "fusions": fusions,
+            "hbm_bytes_saved": sum(s["hbm_bytes_saved"] for s in streams + fusions),
+            "search": {
+                "strategy": strategy,
+                "seed": seed,
+                "evaluations": result["evaluations"],
+                "best_latency_s": result["cost"],
+                "history": result["history"],
+            }
+        }
+
+
+# -------------------------
+# Search: heuristic exploration of the joint multi-accelerator space
+# -------------------------
+class JointDesignSpace:
+    """
+    A point is {"accs": [gene, ...], "mapping": [acc index per mm layer]}, where
+    a gene is {"tile", "pe", "dtype", "dataflow", "replicas", "hbm"}. Cost is the predicted
+    makespan of the mapped layers (accelerators run concurrently), inflated by
+    how far the point exceeds HARDWARE_CONSTRAINTS.
+    """
+    def __init__(self, cdse, layers, num_accs,
+                 tile_options=((64, 64, 64), (128, 128, 64), (256, 256, 128),
+                               (512, 512, 256), (1024, 1024, 512)),
+                 pe_options=((8, 8), (16, 16), (16, 32), (32, 32), (32, 64), (64, 64)),
+                 dtype_options=("fp32",),
+                 dataflow_options=DATAFLOWS,
+                 replica_options=(1, 2, 4),
+                 hbm_options=(1, 2, 4, 8, 16)):
+        self.cdse = cdse
+        self.layers = layers
+        self.num_accs = max(1, num_accs)
+        self.tile_options = list(tile_options)
+        self.pe_options = list(pe_options)
+        self.dtype_options = list(dtype_options)
+        self.dataflow_options = list(dataflow_options)
+        self.replica_options = list(replica_options)
+        self.hbm_options = list(hbm_options)
+
+    # --- point construction ---
+    def pe_choices(self, tile):
+        # The PE array has to divide the tile it sweeps
+        return [pe for pe in self.pe_options if tile[0] % pe[0] == 0 and tile[1] % pe[1] == 0]
+
+    def random_gene(self, rng):
+        tile = rng.choice(self.tile_options)
+        return {
+            "tile": tile,
+            "pe": rng.choice(self.pe_choices(tile)),
+            "dtype": rng.choice(self.dtype_options),
+            "dataflow": rng.choice(self.dataflow_options),
+            "replicas": rng.choice(self.replica_options),
+            "hbm": rng.choice(self.hbm_options),
+        }
+
+    def random_point(self, rng):
+        return {
+            "accs": [self.random_gene(rng) for _ in range(self.num_accs)],
+            "mapping": [rng.randrange(self.num_accs) for _ in self.layers],
+        }
+
+    def copy_point(self, point):
+        return {"accs": [dict(g) for g in point["accs"]], "mapping": list(point["mapping"])}
+
+    def neighbor(self, point, rng):
+        new = self.copy_point(point)
+        if self.layers and self.num_accs > 1 and rng.random() < 0.5:
+            new["mapping"][rng.randrange(len(self.layers))] = rng.randrange(self.num_accs)
+            return new
+
+        gene = new["accs"][rng.randrange(self.num_accs)]
+        field = rng.choice(["tile", "pe", "dtype", "dataflow", "replicas", "hbm"])
+        if field == "tile":
+            gene["tile"] = rng.choice(self.tile_options)
+            if gene["pe"] not in self.pe_choices(gene["tile"]):
+                gene["pe"] = rng.choice(self.pe_choices(gene["tile"]))
+        elif field == "pe":
+            gene["pe"] = rng.choice(self.pe_choices(gene["tile"]))
+        elif field == "dtype":
+            gene["dtype"] = rng.choice(self.dtype_options)
+        elif field == "dataflow":
+            gene["dataflow"] = rng.choice(self.dataflow_options)
+        elif field == "replicas":
+            gene["replicas"] = rng.choice(self.replica_options)
+        else:
+            gene["hbm"] = rng.choice(self.hbm_options)
+        return new
+
+    def crossover(self, a, b, rng):
+        return {
+            "accs": [dict(rng.choice((ga, gb))) for ga, gb in zip(a["accs"], b["accs"])],
+            "mapping": [rng.choice((ma, mb)) for ma, mb in zip(a["mapping"], b["mapping"])],
+        }
+
+    # --- cost model ---
+    def gene_design(self, gene):
+        tile_m, tile_n, tile_k = gene["tile"]
+        acc_type = "large" if tile_m >= 256 else "small"
+        # Only the large template has a tile loop nest to reorder and a PE array to size;
+        # the small one is a streaming loop costed at CDSE's small-kernel DSP count
+        dataflow = gene["dataflow"] if acc_type == "large" else "output_stationary"
+        mem = self.cdse.calculate_memory(tile_m, tile_n, tile_k, DTYPES[gene["dtype"]]["bytes"], dataflow)
+        if acc_type == "large":
+            dsp = gene["pe"][0] * gene["pe"][1]
+        else:
+            dsp = self.cdse.calculate_dsp(tile_m, tile_n, tile_k, "small")
+        design = {
+            "type": acc_type,
+            "tile": gene["tile"],
+            "dtype": gene["dtype"],
+            "dataflow": dataflow,
+            "dsp": dsp * gene["replicas"],
+            "bram_blocks": mem["bram"] * gene["replicas"],
+            "uram_blocks": mem["uram"] * gene["replicas"],
+            "hbm_channels": gene["hbm"],
+        }
+        if acc_type == "large":
+            design["pe"] = gene["pe"]
+        return design
+
+    def busy_times(self, point):
+        designs = [self.gene_design(g) for g in point["accs"]]
+        busy = [0.0] * self.num_accs
+        for layer, idx in zip(self.layers, point["mapping"]):
+            busy[idx] += self.cdse.estimate_layer_latency(layer["M"], layer["K"], layer["N"], designs[idx])
+        return designs, busy
+
+    def violation(self, designs):
+        c = self.cdse.constraints
+        used = {
+            "total_dsp": sum(d["dsp"] for d in designs),
+            "total_bram": sum(d["bram_blocks"] for d in designs),
+            "total_uram": sum(d["uram_blocks"] for d in designs),
+            "total_hbm_channels": sum(d["hbm_channels"] for d in designs),
+        }
+        return sum(max(0.0, used[key] / c[key] - 1.0) for key in used)
+
+    def evaluate(self, point):
+        designs, busy = self.busy_times(point)
+        # Accelerators with no layers are dropped by to_accelerators, so they cost nothing
+        return max(busy) * (1.0 + 10.0 * self.violation([designs[i] for i in set(point["mapping"])]))
+
+    def feasible(self, point):
+        """True when the accelerators that run at least one layer fit the device together."""
+        return self.violation([self.gene_design(point["accs"][i]) for i in set(point["mapping"])]) == 0
+
+    def to_accelerators(self, point):
+        """Turn a point into acc_config entries; accelerators with no layers are dropped."""
+        designs, busy = self.busy_times(point)
+        used = sorted(set(point["mapping"]))
+        types = ["large" if point["accs"][i]["tile"][0] >= 256 else "small" for i in used]
+
+        accelerators, new_index = [], {}
+        for i, acc_type in zip(used, types):
+            gene, design = point["accs"][i], designs[i]
+            same_type = sum(1 for a in accelerators if a["type"] == acc_type)
+            name = f"mm_{acc_type}" if types.count(acc_type) == 1 else f"mm_{acc_type}{same_type}"
+            throughput, _ = self.cdse.estimate_throughput(0, 0, 0, design["dsp"],
+                                                          self.cdse.design_frequency(design))
+            useful_flops = sum(2 * l["M"] * l["K"] * l["N"]
+                               for l, m in zip(self.layers, point["mapping"]) if m == i)
+            new_index[i] = len(accelerators)
+            accelerators.append({
+                "type": acc_type,
+                "name": name,
+                "tile": gene["tile"],
+                "dtype": gene["dtype"],
+                "dataflow": design["dataflow"],
+                "replicas": gene["replicas"],
+                "dsp": design["dsp"],
+                "bram_blocks": design["bram_blocks"],
+                "uram_blocks": design["uram_blocks"],
+                "hbm_channels": design["hbm_channels"],
+                "throughput_GFLOPS": round(throughput, 2),
+                "efficiency": round(useful_flops / (busy[i] * throughput * 1e9), 3) if busy[i] > 0 else 0.0
+            })
+            if "pe" in design:
+                accelerators[-1]["pe"] = design["pe"]
+
+        layer_map = []
+        for i, (layer, idx) in enumerate(zip(self.layers, point["mapping"])):
+            layer_map.append({
+                "name": layer_name(layer, i),
+                "M": layer["M"], "K": layer["K"], "N": layer["N"],
+                "acc": accelerators[new_index[idx]]["name"],
+                "latency_s": self.cdse.estimate_layer_latency(layer["M"], layer["K"], layer["N"], designs[idx]),
+            })
+        return accelerators, layer_map
+
+
+class SearchBudget:
+    """Stops a search after `max_evals` cost evaluations and/or `time_limit` seconds."""
+    def __init__(self, max_evals=None, time_limit=None):
+        if max_evals is None and time_limit is None:
+            max_evals = 2000
+        self.max_evals = max_evals
+        self.time_limit = time_limit
+        self.start_time = time.time()
+
+    def start(self):
+        self.start_time = time.time()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def exhausted(self, evals):
+        if self.max_evals is not None and evals >= self.max_evals:
+            return True
+        return self.time_limit is not None and self.elapsed() >= self.time_limit
+
+
+class SearchStrategy(abc.ABC):
+    """
+    Base class for pluggable search strategies. Subclasses implement search()
+    and call self.evaluate() for every candidate so the budget and the anytime
+    best-so-far curve (over points that fit the device) are tracked uniformly. Runs are deterministic for a given
+    seed under an evaluation budget (a wall-clock budget may cut them short).
+    """
+    name = "base"
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    @traced("search.run")
+    def run(self, space, budget):
+        self.evals = 0
+        self.best_point, self.best_cost = None, float("inf")
+        self.history = []
+        self.budget = budget
+        budget.start()
+        self.search(space, budget)
+        if not self.evals:
+            # A zero budget still scores the seed point
+            self.evaluate(space, space.random_point(self.rng))
+        TRACER.count("design_points_evaluated", self.evals)
+        return {
+            "point": self.best_point,
+            "cost": self.best_cost,
+            "evaluations": self.evals,
+            "history": self.history,
+        }
+
+    def evaluate(self, space, point):
+        cost = space.evaluate(point)
+        self.evals += 1
+        # The penalised cost steers the search; only points that fit can become the answer
+        if cost < self.best_cost and space.feasible(point):
+            self.best_point, self.best_cost = space.copy_point(point), cost
+            self.history.append({
+                "eval": self.evals,
+                "time_s": round(self.budget.elapsed(), 6),
+                "best_latency_s": cost,
+            })
+        return cost
+
+    @abc.abstractmethod
+    def search(self, space, budget):
+        """Explore `space` until `budget` is exhausted, scoring points with self.evaluate()."""
+
+
+class SimulatedAnnealing(SearchStrategy):
+    name = "anneal"
+
+    def __init__(self, seed=0, initial_temp=1.0, cooling=0.995, min_temp=1e-4):
+        super().__init__(seed)
+        self.initial_temp = initial_temp
+        self.cooling = cooling
+        self.min_temp = min_temp
+
+    def search(self, space, budget):
+        current = space.random_point(self.rng)
+        current_cost = self.evaluate(space, current)
+        temp = self.initial_temp
+
+        while not budget.exhausted(self.evals):
+            candidate = space.neighbor(current, self.rng)
+            cost = self.evaluate(space, candidate)
+            # Relative delta keeps the temperature scale independent of model size
+            delta = (cost - current_cost) / max(current_cost, 1e-12)
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temp):
+                current, current_cost = candidate, cost
+            temp = max(self.min_temp, temp * self.cooling)
+
+
+class GeneticSearch(SearchStrategy):
+    name = "genetic"
+
+    def __init__(self, seed=0, population=24, elite=2, tournament=3, mutation_rate=0.3):
+        super().__init__(seed)
+        self.population = population
+        self.elite = elite
+        self.tournament = tournament
+        self.mutation_rate = mutation_rate
+
+    def select(self, scored):
+        contenders = self.rng.sample(scored, min(self.tournament, len(scored)))
+        return min(contenders, key=lambda x: x[0])[1]
+
+    def search(self, space, budget):
+        scored = []
+        for _ in range(self.population):
+            if budget.exhausted(self.evals):
+                return
+            point = space.random_point(self.rng)
+            scored.append((self.evaluate(space, point), point))
+
+        while not budget.exhausted(self.evals):
+            scored.sort(key=lambda x: x[0])
+            next_gen = scored[:self.elite]
+            while len(next_gen) < self.population and not budget.exhausted(self.evals):
+                child = space.crossover(self.select(scored), self.select(scored), self.rng)
+                if self.rng.random() < self.mutation_rate:
+                    child = space.neighbor(child, self.rng)
+                next_gen.append((self.evaluate(space, child), child))
+            scored = next_gen
+
+
+SEARCH_STRATEGIES = {
+    SimulatedAnnealing.name: SimulatedAnnealing,
+    GeneticSearch.name: GeneticSearch,
+}
+
+
+# -------------------------
+# Scale-out: split a model across several U50 cards
+# -------------------------
+class ScaleOutPlanner:
+    """
+    Pipelines a model over `num_cards` cards. Layers (or M/N slices of large
+    GEMMs) are cut into contiguous stages that minimise the slowest stage,
+    counting the PCIe transfer of each stage's output to the next card. Every
+    card then gets its own CDAC composition and host task list.
+    """
+    def __init__(self, cdac, num_cards, link=PCIE_LINK, min_split=256):
+        self.cdac = cdac
+        self.cdse = cdac.cdse
+        self.num_cards = max(1, num_cards)
+        self.link = link
+        self.min_split = min_split
+
+    @traced("scaleout.plan")
+    def plan(self, model_file, num_accs=2, mode="strict"):
+        model = load_model(model_file)
+
+        units = []
+        for idx, layer in enumerate(model["layers"]):
+            if layer.get("type") == "mm":
+                units.append(dict(layer, name=layer.get("name", f"layer{idx}")))
+        if not units:
+            return {"model": model.get("name", "unknown"), "num_cards": self.num_cards, "link": self.link,
+                    "bottleneck_s": 0.0, "imbalance": 1.0, "cards": []}
+
+        # Single-card composition gives the per-layer cost used for partitioning
+        reference = self.cdac.compose_model(model, num_accs, mode)["accelerators"]
+        units, costs, transfers, stages = self.balance(units, reference)
+
+        cards = []
+        for card, (lo, hi) in enumerate(stages):
+            card_layers = units[lo:hi]
+            sub_model = {"name": f"{model.get('name', 'model')}_card{card}",
+                         "layers": [dict(l, type="mm") for l in card_layers]}
+            acc_config = self.cdac.compose_model(sub_model, num_accs, mode)
+            cards.append({
+                "card": card,
+                "layers": [l["name"] for l in card_layers],
+                "compute_s": sum(costs[lo:hi]),
+                "transfer_out_s": transfers[hi - 1] if hi < len(units) else 0.0,
+                "acc_config": acc_config,
+                "tasks": self.task_list(card_layers, acc_config["accelerators"]),
+            })
+
+        stage_times = [c["compute_s"] + c["transfer_out_s"] for c in cards]
+        mean = sum(stage_times) / len(stage_times)
+        return {
+            "model": model.get("name", "unknown"),
+            "num_cards": self.num_cards,
+            "link": self.link,
+            "bottleneck_s": max(stage_times),
+            "imbalance": max(stage_times) / mean if mean > 0 else 1.0,
+            "cards": cards,
+        }
+
+    def unit_latency(self, layer, accelerators):
+        if not accelerators:
+            return float("inf")
+        return min(self.cdse.estimate_layer_latency(layer["M"], layer["K"], layer["N"], acc)
+                   for acc in accelerators)
+
+    def transfer_times(self, units):
+        """
+        PCIe time if a card boundary falls after each unit. The next card needs
+        the whole output of the layer the unit belongs to, so every slice of
+        that layer on this side is sent; if the layer's remaining slices run on
+        the next card, their A/B operands have to be sent there as well.
+        """
+        def parent(u):
+            return u.get("parent", u["name"])
+
+        transfers, sent = [], 0
+        for i, unit in enumerate(units):
+            sent = (sent if i and parent(units[i - 1]) == parent(unit) else 0) + unit["M"] * unit["N"]
+            remote = 0
+            for nxt in units[i + 1:]:
+                if parent(nxt) != parent(unit):
+                    break
+                remote += nxt["M"] * nxt["K"] + nxt["K"] * nxt["N"]
+            transfers.append((sent + remote) * 4 / self.link["bandwidth"] + self.link["latency"])
+        return transfers
+
+    def split(self, layer):
+        """Halve a GEMM along the larger of M/N, or return None if it is already small."""
+        dim = "M" if layer["M"] >= layer["N"] else "N"
+        if layer[dim] < 2 * self.min_split:
+            return None
+        half = layer[dim] // 2
+        parent = layer.get("parent", layer["name"])
+        return [
+            dict(layer, **{dim: half, "name": f"{layer['name']}_{dim.lower()}0", "parent": parent}),
+            dict(layer, **{dim: layer[dim] - half, "name": f"{layer['name']}_{dim.lower()}1", "parent": parent}),
+        ]
+
+    @traced("scaleout.balance")
+    def balance(self, units, accelerators, tolerance=1.1, max_rounds=64):
+        """Repeatedly split the largest unit of the bottleneck stage while that improves the plan."""
+        best = None
+        for _ in range(max_rounds):
+            costs = [self.unit_latency(u, accelerators) for u in units]
+            transfers = self.transfer_times(units)
+            stages = self.partition(costs, transfers)
+            stage_times = [sum(costs[lo:hi]) + (transfers[hi - 1] if hi < len(units) else 0.0)
+                           for lo, hi in stages]
+            bottleneck = max(stage_times)
+            if best is None or bottleneck < best[0]:
+                best = (bottleneck, units, costs, transfers, stages)
+
+            ideal = sum(costs) / self.num_cards
+            if bottleneck <= tolerance * ideal:
+                break
+            lo, hi = stages[stage_times.index(bottleneck)]
+            idx = max(range(lo, hi), key=lambda i: costs[i])
+            halves = self.split(units[idx])
+            if halves is None:
+                break
+            units = units[:idx] + halves + units[idx + 1:]
+        return best[1:]
+
+    def partition(self, costs, transfers):
+        """Contiguous split of units into at most num_cards stages minimising the slowest stage."""
+        n = len(costs)
+        cards = min(self.num_cards, n)
+        prefix = [0.0]
+        for c in costs:
+            prefix.append(prefix[-1] + c)
+
+        def stage_time(lo, hi):
+            return prefix[hi] - prefix[lo] + (transfers[hi - 1] if hi < n else 0.0)
+
+        # best[k][i]: minimal bottleneck placing the first i units on k cards
+        inf = float("inf")
+        best = [[inf] * (n + 1) for _ in range(cards + 1)]
+        cut = [[0] * (n + 1) for _ in range(cards + 1)]
+        best[0][0] = 0.0
+        for k in range(1, cards + 1):
+            for i in range(k, n + 1):
+                for j in range(k - 1, i):
+                    cand = max(best[k - 1][j], stage_time(j, i))
+                    if cand < best[k][i]:
+                        best[k][i], cut[k][i] = cand, j
+
+        stages, i = [], n
+        for k in range(cards, 0, -1):
+            stages.append((cut[k][i], i))
+            i = cut[k][i]
+        return stages[::-1]
+
+    def task_list(self, layers, accelerators):
+        tasks = []
+        for layer in layers:
+            acc = min(accelerators, key=lambda a: self.cdse.estimate_layer_latency(layer["M"], layer["K"], layer["N"], a))
+            tasks.append({"name": layer["name"], "M": layer["M"], "K": layer["K"], "N": layer["N"],
+                          "acc": kernel_name(acc)})
+        return tasks
+
+
+# -------------------------
+# HBM planning: resident weights and activation reuse
+# -------------------------
+class HBMPlanner:
+    """
+    Static HBM layout for steady-state inference. Weights (each layer's B) are
+    placed once in the B channels of the accelerator that runs the layer and
+    stay resident. Activations (C, and A for layers without a producer in the
+    graph) live in the producer's A/C channels and share space with any
+    activation whose lifetime does not overlap, found by liveness analysis
+    over the layer graph. The intermediate of a fused chain stays on chip and
+    a streamed one goes over AXI, so neither gets HBM space. A C read by a
+    layer on another accelerator stays in the producer's channels and the
+    consumer's A port is widened to reach them (port_reach, applied by
+    generate_connectivity). Offsets are relative to the first byte of the
+    region's first channel.
+
+    "layers" lists, per mm layer, the tensors its A, B and C ports use (None
+    when the operand stays on chip) and how it hands its output on, so the
+    host (TaskScheduler::runModel via hbm_map.h) can run the model out of
+    one buffer per region with weights uploaded once.
+    """
+    def __init__(self, cdac):
+        self.cdac = cdac
+        self.channel_bytes = cdac.cdse.constraints["hbm_channel_bytes"]
+
+    @traced("hbm.plan")
+    def plan(self, model, acc_config):
+        layers = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+        accelerators = acc_config["accelerators"]
+        mapping = self.cdac.layer_assignment(layers, acc_config)
+        fused_into = {f["producer"]: f for f in acc_config.get("fusions", [])}
+        streamed_to = {s["producer"]: s["consumer"] for s in acc_config.get("streams", [])}
+        on_chip = fused_into.keys() | streamed_to.keys()
+        edges = self.cdac.layer_graph(layers)
+        producers = {c: p for p, c in edges}
+        # Lifetimes count host launches: a fused pair or a stream chain runs as one step
+        index = {layer_name(l, i): i for i, l in enumerate(layers)}
+        step = list(range(len(layers)))
+        for i, layer in enumerate(layers):
+            name = layer_name(layer, i)
+            partner = fused_into[name]["consumer"] if name in fused_into else streamed_to.get(name)
+            if partner is not None:
+                step[index[partner]] = step[i]
+        consumers, last_use = {}, {}
+        for p, c in edges:
+            consumers.setdefault(p, []).append(c)
+            last_use[p] = max(last_use.get(p, step[p]), step[c])
+
+        # Region per channel range: (first, last) -> list of tensors. Every A/C range gets
+        # one, even if all its operands stay on chip, since the host must bind those ports
+        regions = {split_hbm_channels(acc)[0]: [] for acc in accelerators}
+        tensors, plan_layers = [], []
+        port_reach = {}
+        end = len(layers)
+        for i, (layer, idx) in enumerate(zip(layers, mapping)):
+            acc = accelerators[idx]
+            elem_bytes = DTYPES[acc.get("dtype", "fp32")]["bytes"]
+            a_range, b_range = split_hbm_channels(acc)
+            name = layer_name(layer, i)
+            tensors.append({"name": f"{name}.B", "kind": "weight", "acc": kernel_name(acc), "range": b_range,
+                            "size": layer["K"] * layer["N"] * elem_bytes, "live": (0, end)})
+            if i not in producers:
+                tensors.append({"name": f"{name}.A", "kind": "activation", "acc": kernel_name(acc), "range": a_range,
+                                "size": layer["M"] * layer["K"] * elem_bytes, "live": (step[i], step[i])})
+                a_tensor = f"{name}.A"
+            else:
+                producer = layer_name(layers[producers[i]], producers[i])
+                a_tensor = None if producer in on_chip else f"{producer}.C"
+            fusion = fused_into.get(name)
+            plan_layers.append({"name": name, "acc": kernel_name(acc), "M": layer["M"], "K": layer["K"],
+                                "N": layer["N"], "A": a_tensor, "B": f"{name}.B",
+                                "C": None if name in on_chip else f"{name}.C", "range": a_range,
+                                "fused_with": fusion["consumer"] if fusion else None,
+                                "epilogue": fusion["epilogue"] if fusion else None,
+                                "streams_to": streamed_to.get(name)})
+            if name in on_chip:
+                continue
+            # Graph outputs stay live to the end so the host can read them back
+            tensors.append({"name": f"{name}.C", "kind": "activation", "acc": kernel_name(acc), "range": a_range,
+                            "size": layer["M"] * layer["N"] * elem_bytes,
+                            "live": (step[i], last_use.get(i, end))})
+            for c in consumers.get(i, ()):
+                if mapping[c] != idx:
+                    port = f"{kernel_name(accelerators[mapping[c]])}.A"
+                    lo, hi = port_reach.get(port, a_range)
+                    port_reach[port] = (min(lo, a_range[0]), max(hi, a_range[1]))
+        for t in tensors:
+            regions.setdefault(t["range"], []).append(t)
+
+        region_info, region_index = [], {}
+        for (first, last), members in sorted(regions.items()):
+            used = self.allocate(members)
+            capacity = (last - first + 1) * self.channel_bytes
+            region_index[(first, last)] = len(region_info)
+            region_info.append({"channels": [first, last], "capacity": capacity, "used": used,
+                                "fits": used <= capacity})
+            for t in members:
+                t["channel"] = first + t["offset"] // self.channel_bytes
+                t["region"] = len(region_info) - 1
+        for entry in plan_layers:
+            entry["region"] = region_index[entry.pop("range")]
+
+        activations = [t for t in tensors if t["kind"] == "activation"]
+        return {
+            "channel_bytes": self.channel_bytes,
+            "fits": all(r["fits"] for r in region_info),
+            "weight_bytes": sum(t["size"] for t in tensors if t["kind"] == "weight"),
+            "activation_bytes": sum(r["used"] for r in region_info) - sum(t["size"] for t in tensors if t["kind"] == "weight"),
+            "activation_bytes_without_reuse": sum(t["size"] for t in activations),
+            "port_reach": {port: list(r) for port, r in sorted(port_reach.items())},
+            "regions": region_info,
+            "tensors": [{k: (list(v) if isinstance(v, tuple) else v) for k, v in t.items()} for t in tensors],
+            "layers": plan_layers,
+        }
+
+    @staticmethod
+    def allocate(tensors, alignment=4096):
+        """First-fit offsets, largest first; tensors with overlapping lifetimes never overlap in memory."""
+        placed = []
+        for t in sorted(tensors, key=lambda x: x["size"], reverse=True):
+            conflicts = sorted((p["offset"], p["offset"] + p["size"]) for p in placed
+                               if p["live"][0] <= t["live"][1] and t["live"][0] <= p["live"][1])
+            offset = 0
+            for lo, hi in conflicts:
+                if offset + t["size"] <= lo:
+                    break
+                offset = max(offset, -(-hi // alignment) * alignment)
+            t["offset"] = offset
+            placed.append(t)
+        return max((t["offset"] + t["size"] for t in placed), default=0)
+
+
+# -------------------------
+# Reports: per-layer roofline
+# -------------------------
+ROOFLINE_HTML = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Roofline: {{model}}</title>
+<style>
+body { font-family: sans-serif; margin: 24px; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border: 1px solid #ccc; padding: 3px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.compute { color: #1b7837; } .bandwidth { color: #b2182b; } .padding { color: #d6604d; }
+</style>
+</head>
+<body>
+<h2>Roofline: {{model}}</h2>
+<p>{{summary.compute}} compute-bound, {{summary.bandwidth}} bandwidth-bound, {{summary.padding}} padding-bound layers</p>
+<svg width="{{width}}" height="{{height}}" xmlns="http://www.w3.org/2000/svg" font-size="11">
+  <rect x="{{left}}" y="{{top}}" width="{{plot_w}}" height="{{plot_h}}" fill="none" stroke="#999"/>
+{% for t in x_ticks %}
+  <line x1="{{t.pos}}" y1="{{top}}" x2="{{t.pos}}" y2="{{top + plot_h}}" stroke="#eee"/>
+  <text x="{{t.pos}}" y="{{top + plot_h + 14}}" text-anchor="middle">{{t.label}}</text>
+{% endfor %}
+{% for t in y_ticks %}
+  <line x1="{{left}}" y1="{{t.pos}}" x2="{{left + plot_w}}" y2="{{t.pos}}" stroke="#eee"/>
+  <text x="{{left - 6}}" y="{{t.pos + 4}}" text-anchor="end">{{t.label}}</text>
+{% endfor %}
+  <text x="{{left + plot_w / 2}}" y="{{height - 6}}" text-anchor="middle">arithmetic intensity (FLOP/byte)</text>
+  <text x="14" y="{{top + plot_h / 2}}" text-anchor="middle" transform="rotate(-90 14 {{top + plot_h / 2}})">GFLOPS</text>
+{% for roof in roofs %}
+  <polyline points="{{roof.points}}" fill="none" stroke="{{roof.color}}" stroke-width="2"/>
+  <text x="{{left + plot_w - 4}}" y="{{roof.label_y}}" text-anchor="end" fill="{{roof.color}}">{{roof.acc}}</text>
+{% endfor %}
+{% for p in points %}
+  <circle cx="{{p.x}}" cy="{{p.y}}" r="4" fill="{{p.color}}"><title>{{p.title}}</title></circle>
+{% endfor %}
+</svg>
+<table>
+<tr><th>layer</th><th>M x K x N</th><th>acc</th><th>FLOP/byte</th><th>compute roof (GFLOPS)</th><th>HBM roof (GB/s)</th><th>attainable (GFLOPS)</th><th>useful MACs</th><th>bound</th></tr>
+{% for l in layers %}
+<tr><td>{{l.name}}</td><td>{{l.M}} x {{l.K}} x {{l.N}}</td><td>{{l.acc}}</td><td>{{"%.1f"|format(l.arithmetic_intensity)}}</td><td>{{"%.0f"|format(l.compute_roof_GFLOPS)}}</td><td>{{"%.0f"|format(l.bandwidth_roof_GBps)}}</td><td>{{"%.0f"|format(l.attainable_GFLOPS)}}</td><td>{{"%.0f%%"|format(100 * l.padding_efficiency)}}</td><td class="{{l.bound}}">{{l.bound}}</td></tr>
+{% endfor %}
+</table>
+</body>
+</html>
+""", trim_blocks=True)
+
+ROOFLINE_COLORS = ["#2166ac", "#762a83", "#e08214", "#1b7837", "#b2182b", "#4d4d4d"]
+
+
+class RooflineReport:
+    """
+    Per-layer roofline of a configuration: each layer's arithmetic intensity
+    against the compute and HBM roofs of the accelerator it runs on, the
+    GFLOPS the cost model predicts it attains, and what bounds it. A layer
+    is padding-bound when it is compute-bound but fewer than
+    `padding_threshold` of the MACs the kernel runs are useful.
+    """
+    def __init__(self, cdac, padding_threshold=0.5):
+        self.cdac = cdac
+        self.padding_threshold = padding_threshold
+
+    @traced("roofline.build")
+    def build(self, model, acc_config):
+        cdse = self.cdac.cdse
+        layers = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+        accelerators = acc_config["accelerators"]
+        mapping = self.cdac.layer_assignment(layers, acc_config)
+        # Streamed and fused intermediates never touch HBM
+        handoffs = acc_config.get("streams", []) + acc_config.get("fusions", [])
+        stream_in = {h["consumer"] for h in handoffs}
+        stream_out = {h["producer"] for h in handoffs}
+
+        roofs = [{
+            "acc": kernel_name(acc),
+            "compute_roof_GFLOPS": 2 * acc["dsp"] * cdse.design_frequency(acc) / 1e9,
+            "bandwidth_roof_GBps": cdse.hbm_bandwidth(acc) / 1e9,
+        } for acc in accelerators]
+        for roof in roofs:
+            roof["ridge_point"] = roof["compute_roof_GFLOPS"] / roof["bandwidth_roof_GBps"]
+
+        entries = []
+        for i, (layer, idx) in enumerate(zip(layers, mapping)):
+            name = layer_name(layer, i)
+            M, K, N = layer["M"], layer["K"], layer["N"]
+            cost = cdse.layer_cost(M, K, N, accelerators[idx], name in stream_in, name in stream_out)
+            flops = 2 * M * K * N
+            latency = max(cost["compute_s"], cost["memory_s"])
+            useful = M * K * N / cost["padded_macs"]
+            if cost["memory_s"] > cost["compute_s"]:
+                bound = "bandwidth"
+            elif useful < self.padding_threshold:
+                bound = "padding"
+            else:
+                bound = "compute"
+            entries.append({
+                "name": name, "M": M, "K": K, "N": N,
+                "acc": roofs[idx]["acc"],
+                "arithmetic_intensity": flops / cost["traffic_bytes"],
+                "compute_roof_GFLOPS": roofs[idx]["compute_roof_GFLOPS"],
+                "bandwidth_roof_GBps": roofs[idx]["bandwidth_roof_GBps"],
+                "attainable_GFLOPS": flops / latency / 1e9,
+                "padding_efficiency": useful,
+                "latency_s": latency,
+                "bound": bound,
+            })
+
+        return {
+            "model": acc_config.get("model", model.get("name", "unknown")),
+            "accelerators": roofs,
+            "layers": entries,
+            "summary": {b: sum(e["bound"] == b for e in entries) for b in ("compute", "bandwidth", "padding")},
+        }
+
+    @traced("roofline.write_html")
+    def write_html(self, report, path, width=760, height=440):
+        left, top, right, bottom = 64, 16, 16, 40
+        plot_w, plot_h = width - left - right, height - top - bottom
+
+        intensities = [l["arithmetic_intensity"] for l in report["layers"]] + \
+                      [r["ridge_point"] for r in report["accelerators"]]
+        gflops = [l["attainable_GFLOPS"] for l in report["layers"]] + \
+                 [r["compute_roof_GFLOPS"] for r in report["accelerators"]]
+        x_lo, x_hi = math.floor(math.log10(min(intensities))) - 1, math.ceil(math.log10(max(intensities))) + 1
+        y_lo, y_hi = math.floor(math.log10(min(gflops))) - 1, math.ceil(math.log10(max(gflops))) + 1
+
+        def x_pos(ai):
+            return round(left + (math.log10(ai) - x_lo) / (x_hi - x_lo) * plot_w, 1)
+
+        def y_pos(g):
+            return round(top + (y_hi - math.log10(g)) / (y_hi - y_lo) * plot_h, 1)
+
+        colors = {r["acc"]: ROOFLINE_COLORS[i % len(ROOFLINE_COLORS)] for i, r in enumerate(report["accelerators"])}
+        roofs = []
+        for r in report["accelerators"]:
+            # Bandwidth slope from the left edge up to the ridge point, then flat at peak compute
+            x0 = max(10 ** x_lo, 10 ** y_lo / r["bandwidth_roof_GBps"])
+            start = (x0, r["bandwidth_roof_GBps"] * x0)
+            points = [start, (r["ridge_point"], r["compute_roof_GFLOPS"]), (10 ** x_hi, r["compute_roof_GFLOPS"])]
+            roofs.append({
+                "acc": r["acc"],
+                "color": colors[r["acc"]],
+                "points": " ".join(f"{x_pos(x)},{y_pos(y)}" for x, y in points),
+                "label_y": y_pos(r["compute_roof_GFLOPS"]) - 4,
+            })
+        points = [{
+            "x": x_pos(l["arithmetic_intensity"]),
+            "y": y_pos(l["attainable_GFLOPS"]),
+            "color": colors[l["acc"]],
+            "title": f"{l['name']} {l['M']}x{l['K']}x{l['N']} on {l['acc']}: "
+                     f"{l['attainable_GFLOPS']:.0f} GFLOPS, {l['bound']}-bound",
+        } for l in report["layers"]]
+
+        html = ROOFLINE_HTML.render(
+            model=report["model"], summary=report["summary"], layers=report["layers"],
+            width=width, height=height, left=left, top=top, plot_w=plot_w, plot_h=plot_h,
+            x_ticks=[{"pos": x_pos(10 ** e), "label": f"{10 ** e:g}"} for e in range(x_lo, x_hi + 1)],
+            y_ticks=[{"pos": y_pos(10 ** e), "label": f"{10 ** e:g}"} for e in range(y_lo, y_hi + 1)],
+            roofs=roofs, points=points)
+        with open(path, "w") as f:
+            f.write(html)
+
+
+# -------------------------
+# What-if sessions: incremental re-evaluation
+# -------------------------
+class DesignSession:
+    """
+    Interactive what-if queries over one model. The CDSE design points, their
+    feasibility and every per-shape cost are kept between queries, so after a
+    constraint or layer delta only what the delta touches is recomputed:
+    design points when a constraint they are derived from changes, costs
+    when a design's signature (tile, loop order, DSPs, HBM channels and their
+    bandwidth, clock, SLR crossing) changes, and a shape's best accelerator when the chosen
+    accelerators change or the shape is new. Layers are tracked as shape
+    counts and per-group size sums, so a layer delta is O(1). evaluate()
+    answers from that state in milliseconds; acc_config() runs the full
+    composition (fusion, streams) for code generation.
+
+        session = DesignSession(load_model("models/bert.json"))
+        session.reserve(dsp=500)
+        session.add_layer({"type": "mm", "M": 512, "K": 1024, "N": 1024})
+        session.evaluate()["latency_s"]
+    """
+    # Constraints design_points() reads; anything else only changes feasibility or scores
+    POINT_KEYS = ("total_dsp", "total_hbm_channels", "hbm_bw_per_channel", "hbm_bandwidth", "dsp_frequency")
+    # Constraints the predicted Fmax reads, so the points' throughput annotations go stale with them
+    FMAX_KEYS = ("total_dsp", "total_bram", "total_uram")
+
+    def __init__(self, model, constraints=HARDWARE_CONSTRAINTS, num_accs=2, mode="strict", fmax_model=None):
+        self.model = {**model, "layers": []}
+        self.cdse = CDSE(dict(constraints), fmax_model)
+        self.cdac = CDAC(self.cdse)
+        self.num_accs = num_accs
+        self.mode = mode
+        self._points = {}        # acc_type -> (point-key values, Fmax-key values, design points)
+        self._costs = {}         # (M, K, N) + design signature -> latency
+        self._shapes = {}        # (M, K, N) -> number of mm layers with that shape
+        self._groups = {"large": [0, 0, 0, 0], "small": [0, 0, 0, 0]}  # count, sum M, sum K, sum N
+        self._acc_signatures = None
+        self._best = {}          # (M, K, N) -> (acc index, latency) under _acc_signatures
+        self.rescored = {"points": 0, "costs": 0, "shapes": 0}
+        for layer in model["layers"]:
+            self.add_layer(layer)
+
+    # --- deltas ---
+    def set_constraints(self, **changes):
+        self.cdse.constraints.update(changes)
+
+    def reserve(self, dsp=0, bram=0, uram=0, hbm_channels=0):
+        """Take resources away for other logic on the device."""
+        c = self.cdse.constraints
+        self.set_constraints(total_dsp=c["total_dsp"] - dsp, total_bram=c["total_bram"] - bram,
+                             total_uram=c["total_uram"] - uram,
+                             total_hbm_channels=c["total_hbm_channels"] - hbm_channels)
+
+    def add_layer(self, layer, index=None):
+        layer = dict(layer)
+        self.model["layers"].insert(len(self.model["layers"]) if index is None else index, layer)
+        self._track(layer, 1)
+
+    def update_layer(self, index, **fields):
+        self._track(self.model["layers"][index], -1)
+        self.model["layers"][index].update(fields)
+        self._track(self.model["layers"][index], 1)
+
+    def remove_layer(self, index):
+        self._track(self.model["layers"].pop(index), -1)
+
+    def _track(self, layer, sign):
+        if layer.get("type") != "mm":
+            return
+        shape = (layer["M"], layer["K"], layer["N"])
+        self._shapes[shape] = self._shapes.get(shape, 0) + sign
+        if not self._shapes[shape]:
+            del self._shapes[shape]
+        # Same split as CDAC.group_layers
+        group = self._groups["large" if layer["M"] * layer["K"] * layer["N"] > 1e6 else "small"]
+        for i, value in enumerate((1,) + shape):
+            group[i] += sign * value
+
+    # --- cached evaluation ---
+    def design_points(self, acc_type):
+        key = tuple(self.cdse.constraints.get(k) for k in self.POINT_KEYS)
+        fmax_key = tuple(self.cdse.constraints.get(k) for k in self.FMAX_KEYS)
+        cached = self._points.get(acc_type)
+        if cached is None or cached[0] != key:
+            cached = (key, None, self.cdse.design_points(acc_type))
+            self.rescored["points"] += len(cached[2])
+        if cached[1] != fmax_key:
+            for point in cached[2]:
+                throughput, efficiency = self.cdse.estimate_throughput(0, 0, 0, point["dsp"],
+                                                                       self.cdse.design_frequency(point))
+                point["throughput_GFLOPS"] = round(throughput, 2)
+                point["efficiency"] = round(efficiency, 3)
+            cached = (key, fmax_key, cached[2])
+        self._points[acc_type] = cached
+        return cached[2]
+
+    def signature(self, design):
+        hbm = design["hbm_channels"]
+        return (tuple(design["tile"]), design.get("dataflow", "output_stationary"), design.get("dtype", "fp32"),
+                design["dsp"], hbm if isinstance(hbm, int) else hbm.get("count", 1), self.cdse.hbm_bandwidth(design),
+                bool(design.get("slr_crossing")), self.cdse.design_frequency(design))
+
+    def cost(self, M, K, N, design, signature=None):
+        key = (M, K, N) + (signature or self.signature(design))
+        latency = self._costs.get(key)
+        if latency is None:
+            latency = self._costs[key] = self.cdse.estimate_layer_latency(M, K, N, design)
+            self.rescored["costs"] += 1
+        return latency
+
+    def choose_accelerators(self):
+        """compose_model's per-group choice, from cached points and costs."""
+        accelerators = []
+        for acc_type in ("large", "small"):
+            count, sum_m, sum_k, sum_n = self._groups[acc_type]
+            if not count or len(accelerators) >= self.num_accs:
+                continue
+            feasible = [p for p in self.design_points(acc_type) if self.cdse.is_feasible(p)]
+            if feasible:
+                best = self.cdse.rank_designs(sum_m // count, sum_k // count, sum_n // count, feasible,
+                                              latency=self.cost)[0]
+                accelerators.append(dict(best))
+        self.cdac.assign_hbm_channels(accelerators)
+        self.cdac.assign_slrs(accelerators)
+        self.cdac.assign_clocks(accelerators)
+        return accelerators
+
+    def evaluate(self):
+        """Chosen accelerators and total latency, every layer on its fastest one (no fusion or streams)."""
+        accelerators = self.choose_accelerators()
+        signatures = [self.signature(acc) for acc in accelerators]
+        if signatures != self._acc_signatures:
+            self._acc_signatures, self._best = signatures, {}
+        for shape in self._shapes.keys() - self._best.keys():
+            self._best[shape] = min(((i, self.cost(*shape, acc, sig))
+                                     for i, (acc, sig) in enumerate(zip(accelerators, signatures))),
+                                    key=lambda x: x[1], default=(None, float("inf")))
+            self.rescored["shapes"] += 1
+
+        self._accelerators = accelerators
+        return {
+            "accelerators": accelerators,
+            "feasible": bool(accelerators),
+            "latency_s": sum(count * self._best[shape][1] for shape, count in self._shapes.items()),
+            "rescored": dict(self.rescored),
+        }
+
+    def layer_latencies(self):
+        """Per-layer accelerator and latency under the current model and constraints."""
+        self.evaluate()
+        names = [kernel_name(acc) for acc in self._accelerators]
+        layers = [layer for layer in self.model["layers"] if layer.get("type") == "mm"]
+        result = []
+        for i, layer in enumerate(layers):
+            idx, latency = self._best[(layer["M"], layer["K"], layer["N"])]
+            result.append({"name": layer_name(layer, i), "acc": names[idx] if idx is not None else None,
+                           "latency_s": latency})
+        return result
+
+    def acc_config(self):
+        """Full composition of the current model and constraints, as compose_accelerators returns it."""
+        return self.cdac.compose_model(self.model, self.num_accs, self.mode)
+
+
+# -------------------------
+# Workload: request traces and shape histograms
+# -------------------------
+def bucket_ceil(value):
+    """Round up to a power of two so each bucket is costed at its worst shape."""
+    return 1 << max(0, int(value) - 1).bit_length()
+
+
+@traced("workload.load_histogram")
+def load_request_histogram(trace_file):
+    """
+    Stream a JSONL request trace ({"seq_len": .., "batch": ..} per line) into
+    a histogram over power-of-two (seq_len, batch) buckets. Only the bucket
+    counts are kept, so traces of any length fit in memory. Lines without
+    both fields as positive integers are counted as skipped.
+    """
+    buckets, requests, skipped = {}, 0, 0
+    with open(trace_file) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                req = json.loads(line)
+                seq_len = req.get("seq_len", req.get("sequence_length"))
+                batch = req.get("batch", req.get("batch_size", 1))
+                # JSON true/false would otherwise count as 1/0
+                if isinstance(seq_len, bool) or isinstance(batch, bool):
+                    raise TypeError(line)
+                if int(seq_len) != float(seq_len) or int(batch) != float(batch):
+                    raise ValueError(line)
+                seq_len, batch = int(seq_len), int(batch)
+            except (ValueError, TypeError, AttributeError, OverflowError):
+                seq_len = None
+            if seq_len is None or seq_len <= 0 or batch <= 0:
+                skipped += 1
+                continue
+            key = (bucket_ceil(seq_len), bucket_ceil(batch))
+            buckets[key] = buckets.get(key, 0) + 1
+            requests += 1
+    return {"buckets": buckets, "requests": requests, "skipped": skipped}
+
+
+def scale_model_layers(model, seq_len, batch):
+    """
+    GEMM shapes of `model` for one request. The model's layers are written for
+    its reference "seq_len"/"batch" (default: the first layer's M, batch 1);
+    each layer's "scale" maps dims to "tokens" (batch*seq_len), "seq" or
+    "batch", defaulting to {"M": "tokens"}.
+    """
+    mm = [layer for layer in model["layers"] if layer.get("type") == "mm"]
+    ref_seq = model.get("seq_len", mm[0]["M"] if mm else 1)
+    ref_batch = model.get("batch", 1)
+    ratio = {
+        "tokens": (seq_len * batch) / (ref_seq * ref_batch),
+        "seq": seq_len / ref_seq,
+        "batch": batch / ref_batch,
+    }
+    scaled = []
+    for layer in mm:
+        layer = dict(layer)
+        for dim, by in layer.get("scale", {"M": "tokens"}).items():
+            layer[dim] = max(1, int(math.ceil(layer[dim] * ratio[by])))
+        scaled.append(layer)
+    return scaled
+
 
 # -------------------------
 # HLS Code Generation
 # -------------------------
+def kernel_name(acc):
+    return acc.get("name", f"mm_{acc['type']}")
+
+
+def split_hbm_channels(acc):
+    """(A first, A last), (B first, B last) HBM channels; C shares A's bundle."""
+    hbm_start = acc["hbm_channels"]["start"]
+    hbm_count = max(1, acc["hbm_channels"]["count"])
+    # HBM channel boundary protection: when count < 2, A/B sharing
+    if hbm_count < 2:
+        return (hbm_start, hbm_start), (hbm_start, hbm_start)
+    half = hbm_count // 2
+    return (hbm_start, hbm_start + half - 1), (hbm_start + half, hbm_start + hbm_count - 1)
+
+
 class HLSGenerator:
     def __init__(self):
         self.kernel_template = Template("""// Auto-generated by CHARM CDSE-CDAC
@@ -201,57 +2101,259 @@ class HLSGenerator:
 #define TILE_M {{tile_m}}
 #define TILE_N {{tile_n}}
 #define TILE_K {{tile_k}}
+{% if is_large and dataflow != "output_stationary" %}
+#define PANEL_K {{panel_k}}  // depth of the held {{ "B" if dataflow == "weight_stationary" else "A" }} panel
+{% endif %}
+{% if fuse_width %}
+#define FUSE_N {{fuse_width}}  // widest on-chip intermediate of a fused chain
+{% endif %}
+
+typedef {{data_t}} data_t;
 
 extern "C" {
 void {{kernel_name}}(
-    const float* A,  // HBM channel {{hbm_start}} to {{hbm_end}}
-    const float* B,  // HBM channel {{hbm_b_start}} to {{hbm_b_end}}
-    float* C,
-    int M, int K, int N
+    const data_t* A,  // HBM channel {{hbm_start}} to {{hbm_end}}
+    const data_t* B,  // HBM channel {{hbm_b_start}} to {{hbm_b_end}}
+    data_t* C,
+    int M, int K, int N{{ "," if extra_args else "" }}
+{% if stream_in %}
+    hls::stream<data_t>& A_in,   // chained from {{stream_in}}
+    int chain_in{{ "," if stream_out or fuse_width else " " }}                // 1: read A from A_in instead of HBM
+{% endif %}
+{% if stream_out %}
+    hls::stream<data_t>& C_out,  // chained to {{stream_out}}
+    int chain_out{{ "," if fuse_width else " " }}               // 1: write C to C_out instead of HBM
+{% endif %}
+{% if fuse_width %}
+    const data_t* B2,            // fused chain: second GEMM weights, HBM channel {{hbm_b_start}} to {{hbm_b_end}}
+    int fused,                   // 1: C = epilogue(A*B) * B2, intermediate kept on chip
+    int N2,                      // fused chain: columns of B2 and C
+    int epilogue                 // fused chain: 0 none{% for op in epilogues %}, {{epilogue_codes[op]}} {{op}}{% endfor %}
+
+{% endif %}
 ) {
     #pragma HLS INTERFACE m_axi port=A offset=slave bundle=gmem{{bundle_a}}
     #pragma HLS INTERFACE m_axi port=B offset=slave bundle=gmem{{bundle_b}}
+{% if fuse_width %}
+    #pragma HLS INTERFACE m_axi port=B2 offset=slave bundle=gmem{{bundle_b}}
+{% endif %}
     #pragma HLS INTERFACE m_axi port=C offset=slave bundle=gmem{{bundle_a}}
+{% if stream_in %}
+    #pragma HLS INTERFACE axis port=A_in
+{% endif %}
+{% if stream_out %}
+    #pragma HLS INTERFACE axis port=C_out
+{% endif %}
     #pragma HLS INTERFACE s_axilite port=return
     {{dataflow_pragma}}
 
-    float local_A[TILE_M][TILE_K];
-    float local_B[TILE_K][TILE_N];
-    #pragma HLS ARRAY_PARTITION variable=local_A cyclic factor={{partition_factor}} dim=1
-    #pragma HLS ARRAY_PARTITION variable=local_B cyclic factor={{partition_factor}} dim=2
-    #pragma HLS BIND_STORAGE variable=local_A type=ram_2p impl={{mem_type}}
-    #pragma HLS BIND_STORAGE variable=local_B type=ram_2p impl={{mem_type}}
+    data_t local_A[TILE_M][TILE_K];
+    data_t local_B[TILE_K][TILE_N];
+    #pragma HLS ARRAY_PARTITION variable=local_A cyclic factor={{partition_a}} dim=1
+    #pragma HLS ARRAY_PARTITION variable=local_B cyclic factor={{partition_b}} dim=2
+    #pragma HLS BIND_STORAGE variable=local_A type=ram_2p impl={{mem_a}}
+    #pragma HLS BIND_STORAGE variable=local_B type=ram_2p impl={{mem_b}}
+
+{% if fuse_width %}
+    if (fused) {
+        // Fused chain: a TILE_M x N row block of A*B never leaves URAM before it is multiplied by B2
+        data_t inter[TILE_M][FUSE_N];
+        #pragma HLS BIND_STORAGE variable=inter type=ram_2p impl=uram
+        #pragma HLS ARRAY_PARTITION variable=inter cyclic factor={{partition_a}} dim=1
+
+        for (int ti = 0; ti < M; ti += TILE_M) {
+            int rows = (M - ti < TILE_M) ? M - ti : TILE_M;
+            // Columns of inter past N come out as zeros (zero-filled B), so the second GEMM can run over whole tiles
+            for (int tj = 0; tj < N; tj += TILE_N) {
+                int cols = (N - tj < TILE_N) ? N - tj : TILE_N;
+                for (int tk = 0; tk < K; tk += TILE_K) {
+                    int depth = (K - tk < TILE_K) ? K - tk : TILE_K;
+                    read_block<data_t, TILE_M, TILE_K>(A + ti*K + tk, local_A, rows, depth, K);
+                    read_block<data_t, TILE_K, TILE_N>(B + tk*N + tj, local_B, depth, cols, N);
+                    for (int i = 0; i < TILE_M; i++) {
+                        for (int j = 0; j < TILE_N; j++) {
+                            #pragma HLS PIPELINE II=1
+                            data_t sum = (tk == 0) ? (data_t)0 : inter[i][tj+j];
+                            for (int k = 0; k < TILE_K; k++) {
+                                sum += local_A[i][k] * local_B[k][j];
+                            }
+                            inter[i][tj+j] = sum;
+                        }
+                    }
+                }
+            }
+{% if epilogues %}
+
+            for (int i = 0; i < rows; i++) {
+                row_epilogue<data_t, FUSE_N>(inter[i], N, epilogue);
+            }
+{% endif %}
+
+            for (int tj = 0; tj < N2; tj += TILE_N) {
+                int cols = (N2 - tj < TILE_N) ? N2 - tj : TILE_N;
+                for (int tk = 0; tk < N; tk += TILE_K) {
+                    int depth = (N - tk < TILE_K) ? N - tk : TILE_K;
+                    read_block<data_t, TILE_K, TILE_N>(B2 + tk*N2 + tj, local_B, depth, cols, N2);
+                    for (int i = 0; i < rows; i++) {
+                        for (int j = 0; j < cols; j++) {
+                            #pragma HLS PIPELINE II=1
+                            data_t sum = (tk == 0) ? (data_t)0 : C[(ti+i)*N2 + (tj+j)];
+                            for (int k = 0; k < TILE_K; k++) {
+                                sum += inter[i][tk+k] * local_B[k][j];
+                            }
+                            C[(ti+i)*N2 + (tj+j)] = sum;
+                        }
+                    }
+                }
+            }
+        }
+        return;
+    }
+
+{% endif %}
+{% if is_large and dataflow == "weight_stationary" %}
+    // Weight-stationary: a PANEL_K x TILE_N panel of B is read once and held while every A row tile
+    // streams past it; each C tile accumulates on chip over the panel
+    data_t panel_B[PANEL_K][TILE_N];
+    data_t local_C[TILE_M][TILE_N];
+    #pragma HLS ARRAY_PARTITION variable=panel_B cyclic factor={{partition_b}} dim=2
+    #pragma HLS BIND_STORAGE variable=panel_B type=ram_2p impl=uram
+    #pragma HLS ARRAY_PARTITION variable=local_C cyclic factor={{partition_b}} dim=2
+    #pragma HLS BIND_STORAGE variable=local_C type=ram_2p impl=uram
+
+    for (int tj = 0; tj < N; tj += TILE_N) {
+        int cols = (N - tj < TILE_N) ? N - tj : TILE_N;
+        for (int tp = 0; tp < K; tp += PANEL_K) {
+            int panel = (K - tp < PANEL_K) ? K - tp : PANEL_K;
+            read_block<data_t, PANEL_K, TILE_N>(B + tp*N + tj, panel_B, panel, cols, N);
+
+            for (int ti = 0; ti < M; ti += TILE_M) {
+                int rows = (M - ti < TILE_M) ? M - ti : TILE_M;
+                // Partial sums of earlier panels come back from HBM
+                for (int i = 0; i < TILE_M; i++) {
+                    for (int j = 0; j < TILE_N; j++) {
+                        #pragma HLS PIPELINE II=1
+                        local_C[i][j] = (tp > 0 && i < rows && j < cols) ? C[(ti+i)*N + (tj+j)] : (data_t)0;
+                    }
+                }
+                for (int tk = 0; tk < panel; tk += TILE_K) {
+                    int depth = (panel - tk < TILE_K) ? panel - tk : TILE_K;
+                    read_block<data_t, TILE_M, TILE_K>(A + ti*K + tp + tk, local_A, rows, depth, K);
+                    for (int i = 0; i < TILE_M; i++) {
+                        for (int j = 0; j < TILE_N; j++) {
+                            #pragma HLS PIPELINE II=1
+                            data_t sum = local_C[i][j];
+                            for (int k = 0; k < TILE_K; k++) {
+                                sum += local_A[i][k] * panel_B[tk+k][j];
+                            }
+                            local_C[i][j] = sum;
+                        }
+                    }
+                }
+                for (int i = 0; i < rows; i++) {
+                    for (int j = 0; j < cols; j++) {
+                        #pragma HLS PIPELINE II=1
+                        C[(ti+i)*N + (tj+j)] = local_C[i][j];
+                    }
+                }
+            }
+        }
+    }
+{% elif is_large and dataflow == "input_stationary" %}
+    // Input-stationary: a TILE_M x PANEL_K panel of A is read once and held while every B column tile
+    // streams past it; each C tile accumulates on chip over the panel
+    data_t panel_A[TILE_M][PANEL_K];
+    data_t local_C[TILE_M][TILE_N];
+    #pragma HLS ARRAY_PARTITION variable=panel_A cyclic factor={{partition_a}} dim=1
+    #pragma HLS BIND_STORAGE variable=panel_A type=ram_2p impl=uram
+    #pragma HLS ARRAY_PARTITION variable=local_C cyclic factor={{partition_b}} dim=2
+    #pragma HLS BIND_STORAGE variable=local_C type=ram_2p impl=uram
+
+    for (int ti = 0; ti < M; ti += TILE_M) {
+        int rows = (M - ti < TILE_M) ? M - ti : TILE_M;
+        for (int tp = 0; tp < K; tp += PANEL_K) {
+            int panel = (K - tp < PANEL_K) ? K - tp : PANEL_K;
+            {% if stream_in %}if (chain_in) read_block_stream<data_t, TILE_M, PANEL_K>(A_in, panel_A, rows, panel);
+            else {% endif %}read_block<data_t, TILE_M, PANEL_K>(A + ti*K + tp, panel_A, rows, panel, K);
+
+            for (int tj = 0; tj < N; tj += TILE_N) {
+                int cols = (N - tj < TILE_N) ? N - tj : TILE_N;
+                // Partial sums of earlier panels come back from HBM
+                for (int i = 0; i < TILE_M; i++) {
+                    for (int j = 0; j < TILE_N; j++) {
+                        #pragma HLS PIPELINE II=1
+                        local_C[i][j] = (tp > 0 && i < rows && j < cols) ? C[(ti+i)*N + (tj+j)] : (data_t)0;
+                    }
+                }
+                for (int tk = 0; tk < panel; tk += TILE_K) {
+                    int depth = (panel - tk < TILE_K) ? panel - tk : TILE_K;
+                    read_block<data_t, TILE_K, TILE_N>(B + (tp+tk)*N + tj, local_B, depth, cols, N);
+                    for (int i = 0; i < TILE_M; i++) {
+                        for (int j = 0; j < TILE_N; j++) {
+                            #pragma HLS PIPELINE II=1
+                            data_t sum = local_C[i][j];
+                            for (int k = 0; k < TILE_K; k++) {
+                                sum += panel_A[i][tk+k] * local_B[k][j];
+                            }
+                            local_C[i][j] = sum;
+                        }
+                    }
+                }
+                for (int i = 0; i < rows; i++) {
+                    for (int j = 0; j < cols; j++) {
+                        #pragma HLS PIPELINE II=1
+                        C[(ti+i)*N + (tj+j)] = local_C[i][j];
+                    }
+                }
+            }
+        }
+    }
+{% elif is_large %}
+    // Output-stationary: a C tile accumulates on chip over the whole K reduction and is written once
+    data_t local_C[TILE_M][TILE_N];
+    #pragma HLS ARRAY_PARTITION variable=local_C cyclic factor={{partition_b}} dim=2
+    #pragma HLS BIND_STORAGE variable=local_C type=ram_2p impl=uram
 
-    {% if is_large %}
     for (int ti = 0; ti < M; ti += TILE_M) {
+        int rows = (M - ti < TILE_M) ? M - ti : TILE_M;
         for (int tj = 0; tj < N; tj += TILE_N) {
-            #pragma HLS LOOP_FLATTEN
-            read_block<float, TILE_M, TILE_K>(A + ti*K, local_A, TILE_M, TILE_K, K);
-            read_block<float, TILE_K, TILE_N>(B + tj,    local_B, TILE_K, TILE_N, N);
-
+            int cols = (N - tj < TILE_N) ? N - tj : TILE_N;
             for (int tk = 0; tk < K; tk += TILE_K) {
+                int depth = (K - tk < TILE_K) ? K - tk : TILE_K;
+                {% if stream_in %}if (chain_in) read_block_stream<data_t, TILE_M, TILE_K>(A_in, local_A, rows, depth);
+                else {% endif %}read_block<data_t, TILE_M, TILE_K>(A + ti*K + tk, local_A, rows, depth, K);
+                read_block<data_t, TILE_K, TILE_N>(B + tk*N + tj, local_B, depth, cols, N);
                 for (int i = 0; i < TILE_M; i++) {
                     for (int j = 0; j < TILE_N; j++) {
                         #pragma HLS PIPELINE II=1
-                        float sum = 0;
+                        data_t sum = (tk == 0) ? (data_t)0 : local_C[i][j];
                         for (int k = 0; k < TILE_K; k++) {
                             sum += local_A[i][k] * local_B[k][j];
                         }
-                        C[(ti+i)*N + (tj+j)] = sum;
+                        local_C[i][j] = sum;
                     }
                 }
             }
+
+            // Row-major within the tile, edges clipped: a chained consumer reads A in this order
+            for (int i = 0; i < rows; i++) {
+                for (int j = 0; j < cols; j++) {
+                    #pragma HLS PIPELINE II=1
+                    {% if stream_out %}if (chain_out) C_out.write(local_C[i][j]);
+                    else {% endif %}C[(ti+i)*N + (tj+j)] = local_C[i][j];
+                }
+            }
         }
     }
-    {% else %}
+{% else %}
     // 简化的小核实现：流式加载 + 直算
-    hls::stream<float> a_stream, b_stream;
+    hls::stream<data_t> a_stream, b_stream;
     #pragma HLS STREAM variable=a_stream depth=32
     #pragma HLS STREAM variable=b_stream depth=32
 
     load_A: for(int i = 0; i < M*K; i++) {
         #pragma HLS PIPELINE II=1
-        a_stream.write(A[i]);
+        a_stream.write({% if stream_in %}chain_in ? A_in.read() : {% endif %}A[i]);
     }
 
     load_B: for(int i = 0; i < K*N; i++) {
@@ -262,43 +2364,49 @@ void {{kernel_name}}(
     compute: for(int i = 0; i < M; i++) {
         for(int j = 0; j < N; j++) {
             #pragma HLS PIPELINE II=1
-            float sum = 0;
+            data_t sum = 0;
             for(int k = 0; k < K; k++) {
                 sum += a_stream.read() * b_stream.read();
             }
-            C[i*N + j] = sum;
+            {% if stream_out %}if (chain_out) C_out.write(sum);
+            else {% endif %}C[i*N + j] = sum;
         }
     }
-    {% endif %}
+{% endif %}
 }
 }
-""")
+""", trim_blocks=True)
 
-    def generate_kernels(self, acc_config, output_dir):
+    @traced("hls.generate_kernels")
+    def generate_kernels(self, acc_config, output_dir=KERNEL_DIR):
+        output_dir = Path(output_dir)
         INCLUDE_DIR.mkdir(parents=True, exist_ok=True)
-        KERNEL_DIR.mkdir(exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
         self.generate_utils_header()
 
         for i, acc in enumerate(acc_config["accelerators"]):
             is_large = acc["type"] == "large"
-            self.generate_kernel(acc, i, is_large)
+            self.generate_kernel(acc, i, is_large, output_dir)
 
         print(f"Generated {len(acc_config['accelerators'])} accelerators")
 
+    @traced("hls.utils_header")
     def generate_utils_header(self):
         utils_code = """#ifndef KERNEL_UTILS_H
 #define KERNEL_UTILS_H
 
 #include <ap_int.h>
+#include <hls_math.h>
 #include <hls_stream.h>
 
+// Reads a rows x cols block and zero-fills the rest of the tile, so edge tiles add nothing
 template<typename T, int DIM1, int DIM2>
 void read_block(const T* src, T dst[DIM1][DIM2], int rows, int cols, int ld) {
     #pragma HLS INLINE
-    for (int i = 0; i < rows; i++) {
+    for (int i = 0; i < DIM1; i++) {
         #pragma HLS PIPELINE II=1
-        for (int j = 0; j < cols; j++) {
-            dst[i][j] = src[i*ld + j];
+        for (int j = 0; j < DIM2; j++) {
+            dst[i][j] = (i < rows && j < cols) ? src[i*ld + j] : (T)0;
         }
     }
 }
@@ -314,31 +2422,68 @@ void write_block(T* dst, const T src[DIM1][DIM2], int rows, int cols, int ld) {
     }
 }
 
+// Stream counterpart of read_block: pops exactly rows x cols values, row-major
+template<typename T, int DIM1, int DIM2>
+void read_block_stream(hls::stream<T>& src, T dst[DIM1][DIM2], int rows, int cols) {
+    #pragma HLS INLINE
+    for (int i = 0; i < DIM1; i++) {
+        for (int j = 0; j < DIM2; j++) {
+            #pragma HLS PIPELINE II=1
+            dst[i][j] = (i < rows && j < cols) ? src.read() : (T)0;
+        }
+    }
+}
+
+// Row-wise op on a fused chain's on-chip intermediate: 1 relu, 2 gelu (tanh form), 3 softmax
+template<typename T, int LEN>
+void row_epilogue(T row[LEN], int len, int op) {
+    if (op == 1 || op == 2) {
+        for (int j = 0; j < len; j++) {
+            #pragma HLS PIPELINE II=1
+            T x = row[j];
+            if (op == 1) {
+                row[j] = x > (T)0 ? x : (T)0;
+            } else {
+                row[j] = (T)0.5 * x * ((T)1 + hls::tanh((T)0.7978845608 * (x + (T)0.044715 * x * x * x)));
+            }
+        }
+    } else if (op == 3) {
+        T row_max = row[0];
+        for (int j = 1; j < len; j++) {
+            #pragma HLS PIPELINE II=1
+            row_max = row[j] > row_max ? row[j] : row_max;
+        }
+        T sum = 0;
+        for (int j = 0; j < len; j++) {
+            #pragma HLS PIPELINE II=1
+            row[j] = hls::exp(row[j] - row_max);
+            sum += row[j];
+        }
+        for (int j = 0; j < len; j++) {
+            #pragma HLS PIPELINE II=1
+            row[j] = row[j] / sum;
+        }
+    }
+}
+
 #endif
 """
         with open(INCLUDE_DIR / "utils.h", "w") as f:
             f.write(utils_code)
 
-    def generate_kernel(self, acc, index, is_large):
+    def generate_kernel(self, acc, index, is_large, output_dir=KERNEL_DIR):
         tile_m, tile_n, tile_k = acc["tile"]
 
-        # HBM channel boundary protection: when count < 2, A/B sharing
-        hbm_start = acc["hbm_channels"]["start"]
-        hbm_count = max(1, acc["hbm_channels"]["count"])
-        if hbm_count < 2:
-            hbm_a_start = hbm_start
-            hbm_a_end   = hbm_start
-            hbm_b_start = hbm_start
-            hbm_b_end   = hbm_start
-        else:
-            half = hbm_count // 2
-            hbm_a_start = hbm_start
-            hbm_a_end   = hbm_start + half - 1
-            hbm_b_start = hbm_start + half
-            hbm_b_end   = hbm_start + hbm_count - 1
+        (hbm_a_start, hbm_a_end), (hbm_b_start, hbm_b_end) = split_hbm_channels(acc)
+
+        # A searched design carries its PE array; partition the local buffers to feed it
+        partition_a, partition_b = partition_factors(acc)
+        mem_a, mem_b = buffer_storage(acc)
+        fused = acc.get("fused", {"width": 0, "epilogues": []})
 
         template_vars = {
-            "kernel_name": f"mm_{acc['type']}",
+            "kernel_name": kernel_name(acc),
+            "data_t": DTYPES[acc.get("dtype", "fp32")]["ctype"],
             "tile_m": tile_m,
             "tile_n": tile_n,
             "tile_k": tile_k,
@@ -348,30 +2493,327 @@ void write_block(T* dst, const T src[DIM1][DIM2], int rows, int cols, int ld) {
             "hbm_b_end":   hbm_b_end,
             "bundle_a": 0 if is_large else 1,
             "bundle_b": 1 if is_large else 2,
-            "partition_factor": min(32, max(1, tile_m // 4)) if is_large else 1,
-            "mem_type": "uram" if is_large else "bram",
-            "dataflow_pragma": "#pragma HLS DATAFLOW" if is_large else "",
-            "is_large": is_large
+            "partition_a": partition_a,
+            "partition_b": partition_b,
+            "mem_a": mem_a,
+            "mem_b": mem_b,
+            "dataflow": acc.get("dataflow", "output_stationary"),
+            "panel_k": PANEL_TILES * tile_k,
+            # Stage 1 fills inter in TILE_N columns and stage 2 reads it in TILE_K rows; cover both strides
+            "fuse_width": int(math.ceil(fused["width"] / math.lcm(tile_n, tile_k))) * math.lcm(tile_n, tile_k),
+            "epilogues": fused["epilogues"],
+            "epilogue_codes": EPILOGUES,
+            # The fused path is an if/return around the loop nests, which DATAFLOW does not allow
+            "dataflow_pragma": "#pragma HLS DATAFLOW" if is_large and not fused["width"] else "",
+            "is_large": is_large,
+            "stream_in": acc.get("stream_in"),
+            "stream_out": acc.get("stream_out"),
+            "extra_args": bool(acc.get("stream_in") or acc.get("stream_out") or fused["width"]),
         }
 
-        kernel_code = self.kernel_template.render(template_vars)
-        kernel_path = KERNEL_DIR / f"mm_{acc['type']}.cpp"
-        with open(kernel_path, "w") as f:
+        with TRACER.span("hls.render", kernel=kernel_name(acc)):
+            kernel_code = self.kernel_template.render(template_vars)
+        kernel_path = Path(output_dir) / f"{kernel_name(acc)}.cpp"
+        with TRACER.span("io.write", path=str(kernel_path)), open(kernel_path, "w") as f:
             f.write(kernel_code)
         print(f"  Generated {kernel_path}")
 
+    @traced("hls.connectivity")
+    def generate_connectivity(self, acc_config, cfg_path=SCRIPT_DIR / "hbm_connectivity.cfg", address_map=None):
+        """
+        v++ link config: compute units, HBM banks per port and kernel-to-kernel
+        streams. With an HBMPlanner `address_map`, A ports are widened to the
+        channels holding activations produced on another accelerator.
+        """
+        reach = (address_map or {}).get("port_reach", {})
+        accelerators = acc_config["accelerators"]
+        lines = ["[connectivity]"]
+        for acc in accelerators:
+            name = kernel_name(acc)
+            cus = [f"{name}_{r + 1}" for r in range(acc.get("replicas", 1))]
+            lines.append(f"nk={name}:{len(cus)}:{'.'.join(cus)}")
+
+        for acc in accelerators:
+            name = kernel_name(acc)
+            (a_start, a_end), (b_start, b_end) = split_hbm_channels(acc)
+            lo, hi = reach.get(f"{name}.A", (a_start, a_end))
+            lines.append("")
+            for r in range(acc.get("replicas", 1)):
+                cu = f"{name}_{r + 1}"
+                lines.append(f"sp={cu}.A:HBM[{min(lo, a_start)}:{max(hi, a_end)}]")
+                lines.append(f"sp={cu}.B:HBM[{b_start}:{b_end}]")
+                if "fused" in acc:
+                    lines.append(f"sp={cu}.B2:HBM[{b_start}:{b_end}]")
+                lines.append(f"sp={cu}.C:HBM[{a_start}:{a_end}]")
+
+        # CUs spanning both SLRs (None) are left for the linker to place
+        placed = [f"slr={kernel_name(acc)}_{r + 1}:{slr}"
+                  for acc in accelerators for r, slr in enumerate(acc.get("slr", [])) if slr is not None]
+        if placed:
+            lines.append("")
+            lines.extend(placed)
+
+        if acc_config.get("streams"):
+            lines.append("")
+            connected = set()
+            for stream in acc_config["streams"]:
+                if (stream["src"], stream["dst"]) not in connected:
+                    connected.add((stream["src"], stream["dst"]))
+                    lines.append(f"stream_connect={stream['src']}_1.C_out:{stream['dst']}_1.A_in")
+
+        clocked = [acc for acc in accelerators if "clock_hz" in acc]
+        if clocked:
+            lines += ["", "[clock]"]
+            for acc in clocked:
+                for r in range(acc.get("replicas", 1)):
+                    lines.append(f"freqHz={int(acc['clock_hz'])}:{kernel_name(acc)}_{r + 1}")
+
+        Path(cfg_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(cfg_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"  Generated {cfg_path}")
+
+    def dispatch_entry(self, cdse, accelerators, M, K, N):
+        """[acc, acc2, split_q, latency_s]: M split in quarters, split_q of them to acc, the rest to acc2."""
+        best = None
+        for a, acc in enumerate(accelerators):
+            latency = cdse.estimate_layer_latency(M, K, N, acc)
+            if best is None or latency < best[3]:
+                best = [a, -1, 4, latency]
+        for a, acc in enumerate(accelerators):
+            for b, other in enumerate(accelerators):
+                if a == b:
+                    continue
+                for q in (1, 2, 3):
+                    m_a = (M * q + 3) // 4
+                    if m_a >= M:
+                        continue
+                    # TaskScheduler::runShape enqueues both halves before one finish(), so they overlap
+                    latency = max(cdse.estimate_layer_latency(m_a, K, N, acc),
+                                  cdse.estimate_layer_latency(M - m_a, K, N, other))
+                    if latency < best[3]:
+                        best = [a, b, q, latency]
+        return best
+
+    @traced("hls.dispatch_table")
+    def generate_dispatch_table(self, acc_config, cdse, min_log2=4, max_log2=14,
+                                json_path=DESIGN_DIR / "dispatch_table.json",
+                                header_path=HOST_INCLUDE_DIR / "dispatch_table.h"):
+        """
+        Precompute, for every power-of-two (M, K, N) bucket, the compute unit
+        (and optional host-side M split across two of them) the CDSE cost model
+        predicts to be fastest, so the host routes any GEMM with one lookup.
+        Each bucket is costed at its upper bound.
+        """
+        accelerators = acc_config["accelerators"]
+        if not accelerators:
+            return
+        sizes = [1 << b for b in range(min_log2, max_log2 + 1)]
+        entries = [self.dispatch_entry(cdse, accelerators, M, K, N)
+                   for M in sizes for K in sizes for N in sizes]
+        table = {
+            "min_log2": min_log2,
+            "max_log2": max_log2,
+            "kernels": [kernel_name(acc) for acc in accelerators],
+            "fields": ["acc", "acc2", "split_q", "latency_s"],
+            "entries": entries,
+        }
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump(table, f, separators=(",", ":"))
+        print(f"  Generated {json_path}")
+
+        rows = ",\n".join(f"    {{{a}, {b}, {q}, {latency * 1e6:.3f}f}}" for a, b, q, latency in entries)
+        kernels = ", ".join(f'"{name}"' for name in table["kernels"])
+        header = f"""// Auto-generated by CHARM CDSE-CDAC: GEMM shape -> compute unit dispatch
+#pragma once
+#include <cstdint>
+
+namespace charm_dispatch {{
+
+static const int kMinLog2 = {min_log2};
+static const int kMaxLog2 = {max_log2};
+static const int kBuckets = {len(sizes)};
+static const char* const kKernels[] = {{{kernels}}};
+
+struct Entry {{
+    uint8_t acc;       // index into kKernels
+    int8_t  acc2;      // second kernel for a host-side M split, -1 if none
+    uint8_t split_q;   // quarters of M sent to acc (4 = all)
+    float latency_us;  // predicted latency at the bucket's upper bound
+}};
+
+static const Entry kTable[kBuckets * kBuckets * kBuckets] = {{
+{rows}
+}};
+
+inline int bucket(int x) {{
+    int b = x > 1 ? 32 - __builtin_clz((unsigned)(x - 1)) : 0;  // ceil(log2(x))
+    b = b < kMinLog2 ? kMinLog2 : (b > kMaxLog2 ? kMaxLog2 : b);
+    return b - kMinLog2;
+}}
+
+inline const Entry& lookup(int M, int K, int N) {{
+    return kTable[(bucket(M) * kBuckets + bucket(K)) * kBuckets + bucket(N)];
+}}
+
+}}  // namespace charm_dispatch
+"""
+        Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(header_path, "w") as f:
+            f.write(header)
+        print(f"  Generated {header_path}")
+
+    def generate_hbm_map(self, address_map, header_path=HOST_INCLUDE_DIR / "hbm_map.h"):
+        """
+        HBMPlanner's layout as C++ tables: TaskScheduler allocates one buffer
+        per region, carves every tensor out of it as a sub-buffer at its
+        planned offset and runs the layers against those.
+        """
+        if not address_map["layers"]:
+            return
+        tensor_index = {t["name"]: i for i, t in enumerate(address_map["tensors"])}
+        layer_index = {l["name"]: i for i, l in enumerate(address_map["layers"])}
+
+        def ref(names, name):
+            return names[name] if name is not None else -1
+
+        # Zero-sized buffers are invalid, and ports whose operands all stay on chip still need one
+        regions = ",\n".join(f"    {{{r['channels'][0]}, {max(r['used'], 4096)}ull}}"
+                             for r in address_map["regions"])
+        tensors = ",\n".join(f'    {{"{t["name"]}", {t["region"]}, {t["offset"]}ull, {t["size"]}ull, '
+                             f'{"true" if t["kind"] == "weight" else "false"}}}'
+                             for t in address_map["tensors"])
+        layers = ",\n".join(
+            f'    {{"{l["name"]}", "{l["acc"]}", {l["M"]}, {l["K"]}, {l["N"]}, {l["region"]}, '
+            f'{ref(tensor_index, l["A"])}, {ref(tensor_index, l["B"])}, {ref(tensor_index, l["C"])}, '
+            f'{ref(layer_index, l["fused_with"])}, {EPILOGUES.get(l["epilogue"], 0)}, '
+            f'{ref(layer_index, l["streams_to"])}}}'
+            for l in address_map["layers"])
+        header = f"""// Auto-generated by CHARM CDSE-CDAC: static HBM layout (see HBMPlanner)
+#pragma once
+#include <cstdint>
+
+namespace charm_hbm {{
+
+struct Region {{
+    int channel;       // first HBM pseudo-channel of the region
+    uint64_t bytes;    // one buffer of this size backs every tensor in the region
+}};
+
+struct Tensor {{
+    const char* name;  // <layer>.A / .B / .C
+    int region;        // index into kRegions
+    uint64_t offset;   // bytes from the start of the region
+    uint64_t bytes;
+    bool weight;       // resident: uploaded once, never rewritten
+}};
+
+struct Layer {{
+    const char* name;
+    const char* kernel;
+    int M, K, N;
+    int region;        // region of the kernel's A/C channels, bound to ports whose operand stays on chip
+    int a, b, c;       // indices into kTensors, -1 when the operand stays on chip
+    int fused_with;    // consumer layer run inside this layer's fused kernel, -1 if none
+    int epilogue;      // fused chain epilogue code, 0 none
+    int streams_to;    // consumer layer fed over C_out -> A_in, -1 if none
+}};
+
+static const Region kRegions[] = {{
+{regions}
+}};
+
+static const Tensor kTensors[] = {{
+{tensors}
+}};
+
+static const Layer kLayers[] = {{
+{layers}
+}};
+
+static const int kNumRegions = {len(address_map["regions"])};
+static const int kNumTensors = {len(address_map["tensors"])};
+static const int kNumLayers = {len(address_map["layers"])};
+
+}}  // namespace charm_hbm
+"""
+        Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(header_path, "w") as f:
+            f.write(header)
+        print(f"  Generated {header_path}")
+
 
 # -------------------------
 # Main
 # -------------------------
+def plan_scale_out(cdac, args):
+    link = dict(PCIE_LINK, bandwidth=args.pcie_bw * 1e9)
+    planner = ScaleOutPlanner(cdac, args.cards, link)
+
+    start_time = time.time()
+    plan = planner.plan(args.model, args.num_accs, mode=args.mode)
+    elapsed = time.time() - start_time
+    print(f"Scale-out plan over {args.cards} cards completed in {elapsed:.2f}s")
+    print(f"Bottleneck stage: {plan['bottleneck_s'] * 1e3:.3f} ms  (imbalance {plan['imbalance']:.2f})")
+
+    output = Path(args.output)
+    hls_gen = HLSGenerator()
+    for card in plan["cards"]:
+        acc_path = output.with_name(f"{output.stem}_card{card['card']}{output.suffix}")
+        task_path = output.with_name(f"tasks_card{card['card']}.json")
+        with open(acc_path, "w") as f:
+            json.dump(card["acc_config"], f, indent=2)
+        with open(task_path, "w") as f:
+            json.dump(card["tasks"], f, indent=2)
+        print(f"\n=== Card {card['card']}: {', '.join(card['layers'])} ===")
+        hls_gen.generate_kernels(card["acc_config"], KERNEL_DIR / f"card{card['card']}")
+        hls_gen.generate_connectivity(card["acc_config"], SCRIPT_DIR / f"hbm_connectivity_card{card['card']}.cfg")
+        print(f"  Configuration saved to: {acc_path}")
+        print(f"  Host tasks saved to: {task_path}")
+
+    plan_path = output.with_name("scaleout_plan.json")
+    with open(plan_path, "w") as f:
+        summary = dict(plan, cards=[{k: v for k, v in c.items() if k not in ("acc_config", "tasks")}
+                                    for c in plan["cards"]])
+        json.dump(summary, f, indent=2)
+    print(f"\nScale-out plan saved to: {plan_path}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="CHARM CDSE-CDAC with HLS Generation")
     parser.add_argument("--model", required=True, help="Input model JSON file")
     parser.add_argument("--output", default="design_space/acc_config.json", help="Output config file")
     parser.add_argument("--num_accs", type=int, default=2, help="Number of accelerators")
     parser.add_argument("--mode", choices=["strict", "demo"], default="strict", help="Composition mode")
+    parser.add_argument("--search", choices=["none"] + sorted(SEARCH_STRATEGIES), default="none",
+                        help="Heuristic search over the joint accelerator space instead of per-type composition")
+    parser.add_argument("--max_evals", type=int, default=None, help="Search budget: cost-model evaluations")
+    parser.add_argument("--time_budget", type=float, default=None, help="Search budget: wall-clock seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Search RNG seed")
+    parser.add_argument("--requests", default=None, help="JSONL request trace (seq_len, batch per line) to optimise latency over")
+    parser.add_argument("--objective", choices=["mean", "p99"], default="p99", help="Latency objective for --requests")
+    parser.add_argument("--reports", default=str(PROJECT_ROOT / "_x" / "reports"), help="v++ report dir used to calibrate the Fmax model")
+    parser.add_argument("--cards", type=int, default=1, help="Number of U50 cards to split the model across")
+    parser.add_argument("--pcie_bw", type=float, default=PCIE_LINK["bandwidth"] / 1e9, help="Host link bandwidth per card (GB/s)")
+    parser.add_argument("--trace", default=None, help="Write phase spans, counters and memory as Chrome trace-event JSON")
+    parser.add_argument("--trace_memory", action="store_true",
+                        help="With --trace, record Python heap via tracemalloc instead of peak RSS (much slower)")
     args = parser.parse_args()
 
+    if args.trace:
+        TRACER.enable(memory=args.trace_memory)
+    try:
+        with TRACER.span("main"):
+            run_pipeline(args)
+    finally:
+        if args.trace:
+            peak = TRACER.write(args.trace)
+            source = "Python heap" if args.trace_memory else "RSS"
+            print(f"Trace: {len(TRACER.events)} events, peak {source} {peak / 2**20:.1f} MB -> {args.trace}")
+
+
+def run_pipeline(args):
     DESIGN_DIR.mkdir(exist_ok=True)
     MODEL_DIR.mkdir(exist_ok=True)
 
@@ -379,21 +2821,82 @@ def main():
     print(f"Optimizing for model: {args.model}  (mode={args.mode})")
 
     cdse = CDSE(HARDWARE_CONSTRAINTS)
+    calibrated = cdse.fmax_model.calibrate(args.reports, HARDWARE_CONSTRAINTS)
+    if calibrated:
+        print(f"Fmax model: base {cdse.fmax_model.base_fmax / 1e6:.0f} MHz calibrated from {calibrated} kernel report(s); "
+              f"congestion derates are uncalibrated assumptions")
+    else:
+        print("Fmax model: no kernel reports, base clock and derates are uncalibrated assumptions")
     cdac = CDAC(cdse)
 
+    if args.cards > 1:
+        plan_scale_out(cdac, args)
+        return
+
     start_time = time.time()
-    acc_config = cdac.compose_accelerators(args.model, args.num_accs, mode=args.mode)
+    if args.requests:
+        acc_config = cdac.compose_for_workload(args.model, args.requests, args.num_accs, objective=args.objective)
+    elif args.search != "none":
+        acc_config = cdac.search_accelerators(args.model, args.num_accs, strategy=args.search,
+                                              max_evals=args.max_evals, time_limit=args.time_budget,
+                                              seed=args.seed)
+    else:
+        acc_config = cdac.compose_accelerators(args.model, args.num_accs, mode=args.mode)
     elapsed = time.time() - start_time
 
-    with open(args.output, "w") as f:
+    acc_config["fmax_model"] = cdse.fmax_model.summary()
+    with TRACER.span("io.write", path=args.output), open(args.output, "w") as f:
         json.dump(acc_config, f, indent=2)
 
     print(f"Optimization completed in {elapsed:.2f}s")
     print(f"Total throughput: {acc_config['total_throughput']:.2f} GFLOPS")
+    for stream in acc_config.get("streams", []):
+        print(f"Streaming {stream['producer']} -> {stream['consumer']} ({stream['src']} -> {stream['dst']}), "
+              f"{stream['hbm_bytes_saved'] / 1e6:.1f} MB HBM traffic avoided")
+    for fusion in acc_config.get("fusions", []):
+        epilogue = f" + {fusion['epilogue']}" if fusion["epilogue"] else ""
+        print(f"Fusing {fusion['producer']}{epilogue} -> {fusion['consumer']} in {fusion['acc']}, "
+              f"{fusion['hbm_bytes_saved'] / 1e6:.1f} MB HBM traffic avoided")
+    if "workload" in acc_config:
+        workload = acc_config["workload"]
+        print(f"Workload: {workload['requests']} requests in {len(workload['buckets'])} shape buckets "
+              f"({workload['skipped']} skipped), mean {workload['mean_latency_s'] * 1e3:.3f} ms, "
+              f"p99 {workload['p99_latency_s'] * 1e3:.3f} ms")
+    if "search" in acc_config:
+        search = acc_config["search"]
+        print(f"Search ({search['strategy']}, seed={search['seed']}): {search['evaluations']} evaluations, "
+              f"best makespan {search['best_latency_s'] * 1e3:.3f} ms")
+
+    model = load_model(args.model)
+    address_map = HBMPlanner(cdac).plan(model, acc_config)
 
     print("\n=== Generating HLS Code ===")
     hls_gen = HLSGenerator()
     hls_gen.generate_kernels(acc_config, KERNEL_DIR)
+    hls_gen.generate_connectivity(acc_config, address_map=address_map)
+    hls_gen.generate_dispatch_table(acc_config, cdse)
+    hls_gen.generate_hbm_map(address_map)
+
+    map_path = Path(args.output).with_name("hbm_address_map.json")
+    with TRACER.span("io.write", path=str(map_path)), open(map_path, "w") as f:
+        json.dump(address_map, f, indent=2)
+    print(f"HBM plan: "
+          f"{address_map['weight_bytes'] / 2**20:.1f} MB resident weights, "
+          f"{address_map['activation_bytes'] / 2**20:.1f} MB activations "
+          f"({address_map['activation_bytes_without_reuse'] / 2**20:.1f} MB without reuse) -> {map_path}")
+    if not address_map["fits"]:
+        print("WARNING: HBM plan exceeds the assigned channels' capacity")
+
+    roofline = RooflineReport(cdac)
+    report = roofline.build(model, acc_config)
+    report_path = Path(args.output).with_name("roofline.json")
+    with TRACER.span("io.write", path=str(report_path)), open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    if report["layers"]:
+        roofline.write_html(report, report_path.with_suffix(".html"))
+    summary = report["summary"]
+    print(f"Roofline: {summary['compute']} compute-bound, {summary['bandwidth']} bandwidth-bound, "
+          f"{summary['padding']} padding-bound layers -> {report_path}")
 
     print(f"\nConfiguration saved to: {args.output}")
     print("HLS code generation completed!")
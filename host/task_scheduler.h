@@ -3,17 +3,29 @@
 #include <map>
 #include <CL/cl2.hpp>
 #include <CL/cl_ext_xilinx.h>
+#include "dispatch_table.h"
+#include "hbm_map.h"
 
 class TaskScheduler {
 public:
+    // 内核参数约定：0-5 固定为 A, B, C, M, K, N；流式链接的内核在其后依次追加
+    // A_in(6), chain_in(7) 和 C_out, chain_out（无 A_in 时为 6/7，否则为 8/9）；
+    // 带融合路径的内核最后再追加 B2, fused, N2, epilogue，fused_arg 为 B2 的下标。
+    // 流端口由 stream_connect 连接，主机不设置；下面三个字段为 0 表示内核没有该端口。
     struct KernelConfig {
         std::string name;
         cl::Kernel kernel;
         int hbm_channel_start;
         int hbm_channel_count;
+        int chain_in_arg;
+        int chain_out_arg;
+        int fused_arg;
     };
 
-    TaskScheduler(cl::Context& context) : context_(context) {
+    // 乱序队列：流式链接的生产者/消费者必须同时运行，否则生产者写满流后死锁
+    TaskScheduler(cl::Context& context)
+        : context_(context),
+          queue_(context, context.getInfo<CL_CONTEXT_DEVICES>()[0], CL_QUEUE_OUT_OF_ORDER_EXEC_MODE_ENABLE) {
         // 初始化HBM错误处理缓冲区（32个通道）
         hbm_ptrs_.resize(32);
         for (int i = 0; i < 32; i++) {
@@ -28,7 +40,28 @@ public:
     }
 
     void runTask(const std::string& name, int M, int K, int N) {
+        enqueueTask(name, M, K, N);
+        finish();
+    }
+
+    // 融合链：C = epilogue(A*B) * B2（M x K -> M x N -> M x N2），中间结果不出片
+    void runFused(const std::string& name, int M, int K, int N, int N2, int epilogue) {
+        enqueueTask(name, M, K, N, false, false, N2, epilogue);
+        finish();
+    }
+
+    // producer 的 C 经 AXI 流直接作为 consumer 的 A（M x N -> M x N2），两者一起入队
+    void runChain(const std::string& producer, const std::string& consumer, int M, int K, int N, int N2) {
+        enqueueTask(producer, M, K, N, false, true);
+        enqueueTask(consumer, M, N, N2, true, false);
+        finish();
+    }
+
+    // 任意形状的单次任务：每次调用都新建 A/B/C 缓冲区。按模型推理请用 loadAddressMap()/runModel()
+    void enqueueTask(const std::string& name, int M, int K, int N, bool chain_in = false, bool chain_out = false,
+                     int N2 = 0, int epilogue = 0) {
         auto& config = kernels_[name];
+        int c_cols = N2 > 0 ? N2 : N;
         
         cl_mem_ext_ptr_t a_ext = hbm_ptrs_[config.hbm_channel_start];
         cl_mem_ext_ptr_t b_ext = hbm_ptrs_[config.hbm_channel_start + config.hbm_channel_count/2];
@@ -39,22 +72,131 @@ public:
         cl::Buffer B(context_, CL_MEM_READ_ONLY | CL_MEM_EXT_PTR_XILINX,
                     K*N*sizeof(float), &b_ext);
         cl::Buffer C(context_, CL_MEM_WRITE_ONLY | CL_MEM_EXT_PTR_XILINX,
-                    M*N*sizeof(float), &c_ext);
+                    M*c_cols*sizeof(float), &c_ext);
+        // 非融合调用也必须设置全部参数：B2 指向 B，fused = 0
+        cl::Buffer B2 = B;
+        if (N2 > 0) {
+            B2 = cl::Buffer(context_, CL_MEM_READ_ONLY | CL_MEM_EXT_PTR_XILINX, N*N2*sizeof(float), &b_ext);
+        }
+
+        launch(config, A, B, C, M, K, N, chain_in, chain_out, B2, N2, epilogue);
+        // 缓冲区须存活到 finish()
+        buffers_.push_back(A);
+        buffers_.push_back(B);
+        buffers_.push_back(C);
+        buffers_.push_back(B2);
+    }
+
+    // 按 hbm_map.h 的静态布局，每个区域只分配一个缓冲区，张量是其中按规划偏移切出的子缓冲区
+    void loadAddressMap() {
+        regions_.clear();
+        tensors_.clear();
+        for (int r = 0; r < charm_hbm::kNumRegions; r++) {
+            const auto& region = charm_hbm::kRegions[r];
+            regions_.emplace_back(context_, CL_MEM_READ_WRITE | CL_MEM_EXT_PTR_XILINX, region.bytes,
+                                  &hbm_ptrs_[region.channel]);
+        }
+        for (int t = 0; t < charm_hbm::kNumTensors; t++) {
+            const auto& tensor = charm_hbm::kTensors[t];
+            cl_buffer_region sub = {tensor.offset, tensor.bytes};
+            tensors_.push_back(regions_[tensor.region].createSubBuffer(CL_MEM_READ_WRITE,
+                                                                       CL_BUFFER_CREATE_TYPE_REGION, &sub));
+            tensor_index_[tensor.name] = t;
+        }
+    }
+
+    // 权重常驻：每个权重（"<layer>.B"）只上传一次，之后每次推理只搬运激活
+    void loadWeights(const std::map<std::string, const float*>& weights) {
+        for (const auto& w : weights) {
+            int t = tensor_index_.at(w.first);
+            queue_.enqueueWriteBuffer(tensors_[t], CL_FALSE, 0, charm_hbm::kTensors[t].bytes, w.second);
+        }
+        queue_.finish();
+    }
+
+    // 模型输入（"<layer>.A"）写入与输出（"<layer>.C"）读回
+    void writeTensor(const std::string& name, const float* data) {
+        int t = tensor_index_.at(name);
+        queue_.enqueueWriteBuffer(tensors_[t], CL_TRUE, 0, charm_hbm::kTensors[t].bytes, data);
+    }
+
+    void readTensor(const std::string& name, float* data) {
+        int t = tensor_index_.at(name);
+        queue_.enqueueReadBuffer(tensors_[t], CL_TRUE, 0, charm_hbm::kTensors[t].bytes, data);
+    }
 
+    // 在常驻缓冲区上按层序运行整个模型：融合链作为一次任务，流式链接的层一起入队
+    void runModel() {
+        std::vector<bool> done(charm_hbm::kNumLayers, false);
+        for (int i = 0; i < charm_hbm::kNumLayers; i++) {
+            if (done[i]) continue;
+            const auto& l = charm_hbm::kLayers[i];
+            if (l.fused_with >= 0) {
+                const auto& c = charm_hbm::kLayers[l.fused_with];
+                launch(kernels_[l.kernel], operand(l, l.a), tensors_[l.b], operand(c, c.c), l.M, l.K, l.N,
+                       false, false, tensors_[c.b], c.N, l.epilogue);
+                done[i] = done[l.fused_with] = true;
+            } else {
+                bool chain_in = false;
+                for (int j = i; j >= 0; j = charm_hbm::kLayers[j].streams_to) {
+                    const auto& x = charm_hbm::kLayers[j];
+                    launch(kernels_[x.kernel], operand(x, x.a), tensors_[x.b], operand(x, x.c), x.M, x.K, x.N,
+                           chain_in, x.streams_to >= 0, tensors_[x.b], 0, 0);
+                    done[j] = chain_in = true;
+                }
+            }
+            queue_.finish();
+        }
+    }
+
+    void finish() {
+        queue_.finish();
+        buffers_.clear();
+    }
+
+    // 按生成的分派表路由任意形状的GEMM（可能在主机侧沿M切分到两个内核）。
+    // 两半同时入队、只 finish 一次，与分派表按 max(两半) 估算的延迟一致。
+    void runShape(int M, int K, int N) {
+        const charm_dispatch::Entry& e = charm_dispatch::lookup(M, K, N);
+        int m_first = e.acc2 < 0 ? M : (M * e.split_q + 3) / 4;
+        enqueueTask(charm_dispatch::kKernels[e.acc], m_first, K, N);
+        if (e.acc2 >= 0 && M > m_first) {
+            enqueueTask(charm_dispatch::kKernels[e.acc2], M - m_first, K, N);
+        }
+        finish();
+    }
+
+private:
+    void launch(KernelConfig& config, const cl::Buffer& A, const cl::Buffer& B, const cl::Buffer& C,
+                int M, int K, int N, bool chain_in, bool chain_out, const cl::Buffer& B2, int N2, int epilogue) {
         config.kernel.setArg(0, A);
         config.kernel.setArg(1, B);
         config.kernel.setArg(2, C);
         config.kernel.setArg(3, M);
         config.kernel.setArg(4, K);
         config.kernel.setArg(5, N);
-        
-        cl::CommandQueue queue(context_, context_.getInfo<CL_CONTEXT_DEVICES>()[0]);
-        queue.enqueueTask(config.kernel);
-        queue.finish();
+        if (config.chain_in_arg) config.kernel.setArg(config.chain_in_arg, chain_in ? 1 : 0);
+        if (config.chain_out_arg) config.kernel.setArg(config.chain_out_arg, chain_out ? 1 : 0);
+        if (config.fused_arg) {
+            config.kernel.setArg(config.fused_arg, B2);
+            config.kernel.setArg(config.fused_arg + 1, N2 > 0 ? 1 : 0);
+            config.kernel.setArg(config.fused_arg + 2, N2);
+            config.kernel.setArg(config.fused_arg + 3, epilogue);
+        }
+        queue_.enqueueTask(config.kernel);
+    }
+
+    // 留在片上的操作数（流或融合中间结果）不读写 HBM，端口仍需绑定该内核通道上的缓冲区
+    const cl::Buffer& operand(const charm_hbm::Layer& layer, int tensor) const {
+        return tensor >= 0 ? tensors_[tensor] : regions_[layer.region];
     }
 
-private:
     cl::Context& context_;
+    cl::CommandQueue queue_;
+    std::vector<cl::Buffer> buffers_;
+    std::vector<cl::Buffer> regions_;
+    std::vector<cl::Buffer> tensors_;
+    std::map<std::string, int> tensor_index_;
     std::map<std::string, KernelConfig> kernels_;
     std::vector<cl_mem_ext_ptr_t> hbm_ptrs_; 
 };
\ No newline at end of file
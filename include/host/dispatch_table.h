@@ -0,0 +1,1363 @@
+// Auto-generated by CHARM CDSE-CDAC: GEMM shape -> compute unit dispatch
+#pragma once
+#include <cstdint>
+
+namespace charm_dispatch {
+
+static const int kMinLog2 = 4;
+static const int kMaxLog2 = 14;
+static const int kBuckets = 11;
+static const char* const kKernels[] = {"mm_large"};
+
+struct Entry {
+    uint8_t acc;       // index into kKernels
+    int8_t  acc2;      // second kernel for a host-side M split, -1 if none
+    uint8_t split_q;   // quarters of M sent to acc (4 = all)
+    float latency_us;  // predicted latency at the bucket's upper bound
+};
+
+static const Entry kTable[kBuckets * kBuckets * kBuckets] = {
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.727f},
+    {0, -1, 4, 21.454f},
+    {0, -1, 4, 42.908f},
+    {0, -1, 4, 85.817f},
+    {0, -1, 4, 171.634f},
+    {0, -1, 4, 343.268f},
+    {0, -1, 4, 686.536f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 10.240f},
+    {0, -1, 4, 14.303f},
+    {0, -1, 4, 28.606f},
+    {0, -1, 4, 57.211f},
+    {0, -1, 4, 114.423f},
+    {0, -1, 4, 228.845f},
+    {0, -1, 4, 457.690f},
+    {0, -1, 4, 915.381f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 21.454f},
+    {0, -1, 4, 42.908f},
+    {0, -1, 4, 85.817f},
+    {0, -1, 4, 171.634f},
+    {0, -1, 4, 343.268f},
+    {0, -1, 4, 686.536f},
+    {0, -1, 4, 1373.071f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 164.483f},
+    {0, -1, 4, 328.965f},
+    {0, -1, 4, 657.930f},
+    {0, -1, 4, 1315.860f},
+    {0, -1, 4, 2631.720f},
+    {0, -1, 4, 5263.440f},
+    {0, -1, 4, 10526.881f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 336.116f},
+    {0, -1, 4, 672.233f},
+    {0, -1, 4, 1344.466f},
+    {0, -1, 4, 2688.931f},
+    {0, -1, 4, 5377.863f},
+    {0, -1, 4, 10755.726f},
+    {0, -1, 4, 21511.452f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 679.384f},
+    {0, -1, 4, 1358.769f},
+    {0, -1, 4, 2717.537f},
+    {0, -1, 4, 5435.074f},
+    {0, -1, 4, 10870.148f},
+    {0, -1, 4, 21740.297f},
+    {0, -1, 4, 43480.594f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1365.920f},
+    {0, -1, 4, 2731.840f},
+    {0, -1, 4, 5463.680f},
+    {0, -1, 4, 10927.360f},
+    {0, -1, 4, 21854.720f},
+    {0, -1, 4, 43709.439f},
+    {0, -1, 4, 87418.878f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 20.480f},
+    {0, -1, 4, 25.030f},
+    {0, -1, 4, 50.060f},
+    {0, -1, 4, 100.120f},
+    {0, -1, 4, 200.240f},
+    {0, -1, 4, 400.479f},
+    {0, -1, 4, 800.958f},
+    {0, -1, 4, 1601.917f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 40.960f},
+    {0, -1, 4, 46.484f},
+    {0, -1, 4, 92.968f},
+    {0, -1, 4, 185.937f},
+    {0, -1, 4, 371.874f},
+    {0, -1, 4, 743.747f},
+    {0, -1, 4, 1487.494f},
+    {0, -1, 4, 2974.988f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 81.920f},
+    {0, -1, 4, 89.393f},
+    {0, -1, 4, 178.785f},
+    {0, -1, 4, 357.571f},
+    {0, -1, 4, 715.141f},
+    {0, -1, 4, 1430.283f},
+    {0, -1, 4, 2860.565f},
+    {0, -1, 4, 5721.131f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 163.840f},
+    {0, -1, 4, 175.210f},
+    {0, -1, 4, 350.419f},
+    {0, -1, 4, 700.839f},
+    {0, -1, 4, 1401.677f},
+    {0, -1, 4, 2803.354f},
+    {0, -1, 4, 5606.708f},
+    {0, -1, 4, 11213.416f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 327.680f},
+    {0, -1, 4, 346.844f},
+    {0, -1, 4, 693.687f},
+    {0, -1, 4, 1387.374f},
+    {0, -1, 4, 2774.748f},
+    {0, -1, 4, 5549.497f},
+    {0, -1, 4, 11098.994f},
+    {0, -1, 4, 22197.987f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 2684354.560f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 655.360f},
+    {0, -1, 4, 690.111f},
+    {0, -1, 4, 1380.223f},
+    {0, -1, 4, 2760.446f},
+    {0, -1, 4, 5520.891f},
+    {0, -1, 4, 11041.782f},
+    {0, -1, 4, 22083.565f},
+    {0, -1, 4, 44167.130f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 1310.720f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 2621.440f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 5242.880f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 10485.760f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 20971.520f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 41943.040f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 2684354.560f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 83886.080f},
+    {0, -1, 4, 167772.160f},
+    {0, -1, 4, 335544.320f},
+    {0, -1, 4, 671088.640f},
+    {0, -1, 4, 1342177.280f},
+    {0, -1, 4, 2684354.560f},
+    {0, -1, 4, 5368709.120f}
+};
+
+inline int bucket(int x) {
+    int b = x > 1 ? 32 - __builtin_clz((unsigned)(x - 1)) : 0;  // ceil(log2(x))
+    b = b < kMinLog2 ? kMinLog2 : (b > kMaxLog2 ? kMaxLog2 : b);
+    return b - kMinLog2;
+}
+
+inline const Entry& lookup(int M, int K, int N) {
+    return kTable[(bucket(M) * kBuckets + bucket(K)) * kBuckets + bucket(N)];
+}
+
+}  // namespace charm_dispatch
@@ -0,0 +1,58 @@
+// Auto-generated by CHARM CDSE-CDAC: static HBM layout (see HBMPlanner)
+#pragma once
+#include <cstdint>
+
+namespace charm_hbm {
+
+struct Region {
+    int channel;       // first HBM pseudo-channel of the region
+    uint64_t bytes;    // one buffer of this size backs every tensor in the region
+};
+
+struct Tensor {
+    const char* name;  // <layer>.A / .B / .C
+    int region;        // index into kRegions
+    uint64_t offset;   // bytes from the start of the region
+    uint64_t bytes;
+    bool weight;       // resident: uploaded once, never rewritten
+};
+
+struct Layer {
+    const char* name;
+    const char* kernel;
+    int M, K, N;
+    int region;        // region of the kernel's A/C channels, bound to ports whose operand stays on chip
+    int a, b, c;       // indices into kTensors, -1 when the operand stays on chip
+    int fused_with;    // consumer layer run inside this layer's fused kernel, -1 if none
+    int epilogue;      // fused chain epilogue code, 0 none
+    int streams_to;    // consumer layer fed over C_out -> A_in, -1 if none
+};
+
+static const Region kRegions[] = {
+    {0, 75497472ull},
+    {1, 21102592ull}
+};
+
+static const Tensor kTensors[] = {
+    {"layer0.B", 1, 16777216ull, 4194304ull, true},
+    {"layer0.A", 0, 0ull, 12582912ull, false},
+    {"layer0.C", 0, 50331648ull, 12582912ull, false},
+    {"layer1.B", 1, 0ull, 16777216ull, true},
+    {"layer1.A", 0, 0ull, 50331648ull, false},
+    {"layer1.C", 0, 62914560ull, 12582912ull, false},
+    {"layer2.B", 1, 20971520ull, 131072ull, true},
+    {"layer2.A", 0, 0ull, 1048576ull, false},
+    {"layer2.C", 0, 1048576ull, 131072ull, false}
+};
+
+static const Layer kLayers[] = {
+    {"layer0", "mm_large", 3072, 1024, 1024, 0, 1, 0, 2, -1, 0, -1},
+    {"layer1", "mm_large", 3072, 4096, 1024, 0, 4, 3, 5, -1, 0, -1},
+    {"layer2", "mm_large", 512, 512, 64, 0, 7, 6, 8, -1, 0, -1}
+};
+
+static const int kNumRegions = 2;
+static const int kNumTensors = 9;
+static const int kNumLayers = 3;
+
+}  // namespace charm_hbm
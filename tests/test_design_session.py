@@ -0,0 +1,55 @@
+"""DesignSession answers after a constraint delta must match a session built from scratch."""
+
+import contextlib
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_hls import HARDWARE_CONSTRAINTS, DesignSession  # noqa: E402
+
+
+def random_model(num_layers=200, seed=0):
+    rng = random.Random(seed)
+
+    def dim():
+        base = 1 << rng.randint(4, 12)
+        return base if rng.random() < 0.7 else max(1, base + rng.randint(-base // 3, base // 3))
+
+    return {"name": "random", "layers": [{"type": "mm", "name": f"r{i}", "M": dim(), "K": dim(), "N": dim()}
+                                         for i in range(num_layers)]}
+
+
+def answers(session):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = session.evaluate()
+        points = [(p["throughput_GFLOPS"], p["efficiency"])
+                  for acc_type in ("large", "small") for p in session.design_points(acc_type)]
+        return (result["latency_s"], [session.signature(acc) for acc in result["accelerators"]], points,
+                session.layer_latencies())
+
+
+@pytest.mark.parametrize("key", sorted(HARDWARE_CONSTRAINTS))
+@pytest.mark.parametrize("scale", [1 / 512, 0.5, 2.0])
+def test_incremental_matches_fresh(key, scale):
+    model = random_model()
+    value = HARDWARE_CONSTRAINTS[key] * scale
+    if isinstance(HARDWARE_CONSTRAINTS[key], int):
+        value = max(1, int(value))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        session = DesignSession(model)
+        session.evaluate()
+        session.set_constraints(**{key: value})
+        fresh = DesignSession(model, constraints={**HARDWARE_CONSTRAINTS, key: value})
+
+    assert answers(session) == answers(fresh)
+
+
+def test_layer_latencies_before_evaluate():
+    session = DesignSession(random_model(20))
+    assert len(session.layer_latencies()) == 20